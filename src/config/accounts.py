@@ -109,3 +109,7 @@ ACCOUNT_NAMES = {
     "100140": "Veritex Bank - Funding DDA",
     "100150": "Veritex Bank - Operating DDA",
 }
+
+# The code constants above and the ACCOUNT_NAMES keys are identical string
+# literals, which CPython already interns and shares, so lookups keyed by
+# the constants hit the identity fast path without explicit sys.intern().
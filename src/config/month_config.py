@@ -6,7 +6,8 @@ from dataclasses import dataclass, field
 from decimal import Decimal
 from datetime import date
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 import calendar
 import glob
 
@@ -22,8 +23,9 @@ class MonthConfig:
     je_date: date           # last day of month
     data_dir: Path
     output_dir: Path
-    prior_balances: dict    # QBO balances as of prior month-end
-    file_paths: dict        # resolved source file paths
+    prior_balances: Mapping       # QBO balances as of prior month-end
+    file_paths: dict              # resolved source file paths
+    prior_balances_abs: Mapping   # abs() of each prior balance (credit-normal accounts)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -72,6 +74,16 @@ KNOWN_BALANCES = {
     },
 }
 
+# Freeze the balance tables (they are shared by every run in the process)
+# and precompute their absolute values once, since credit-normal accounts
+# are stored negative but mostly consumed as magnitudes.
+KNOWN_BALANCES_ABS = {
+    month: MappingProxyType({k: abs(v) for k, v in balances.items()})
+    for month, balances in KNOWN_BALANCES.items()
+}
+KNOWN_BALANCES = {month: MappingProxyType(balances)
+                  for month, balances in KNOWN_BALANCES.items()}
+
 
 def _find_file(data_dir: Path, patterns: list[str], label: str) -> Optional[Path]:
     """Find a file matching any of the given glob patterns."""
@@ -205,4 +217,5 @@ def resolve_month(month_str: str, data_dir_override: Optional[str] = None) -> Mo
         output_dir=output_dir,
         prior_balances=prior_balances,
         file_paths=file_paths,
+        prior_balances_abs=KNOWN_BALANCES_ABS[month_str],
     )
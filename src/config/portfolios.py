@@ -28,13 +28,17 @@ LOAN_TYPES = {
     "NLS": "New Loan System (Nortridge)",
 }
 
-VALID_PORTFOLIO_IDS = set(PORTFOLIO_STATE_MAP.keys())
-VALID_BRANCH_IDS = set(BRANCH_MAP.keys())
+VALID_PORTFOLIO_IDS = frozenset(PORTFOLIO_STATE_MAP)
+VALID_BRANCH_IDS = frozenset(BRANCH_MAP)
+
+
+# QBO class per portfolio; inactive/unassigned portfolios book to "SET"
+_CLASS_NAMES = {
+    portfolio_id: "SET" if state in ("UNKNOWN", "BH") else state
+    for portfolio_id, state in PORTFOLIO_STATE_MAP.items()
+}
 
 
 def get_class_name(portfolio_id: int) -> str:
     """Map portfolio ID to QBO class name."""
-    state = PORTFOLIO_STATE_MAP.get(portfolio_id)
-    if state in (None, "UNKNOWN", "BH"):
-        return "SET"
-    return state
+    return _CLASS_NAMES.get(portfolio_id, "SET")
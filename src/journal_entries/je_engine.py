@@ -2,15 +2,30 @@
 Journal Entry Engine for SET Financial Corporation EOM Close.
 Generates all 10 journal entry types from parsed source data.
 """
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from dataclasses import dataclass, field
 from datetime import date
 from typing import Optional
-import sys
-import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from config.accounts import *
+from config.accounts import (
+    ACCOUNT_NAMES, INSURANCE_MAPPING,
+    FINANCE_INCOME, EARNED_INS_REBATES, CUSTOMER_RECOVERIES, SALE_OF_BAD_DEBT,
+    DELINQUENT_NSF_FEES, REFUNDS, INTEREST_EXPENSE,
+    BAD_DEBT_WRITEOFFS, ALLOWANCE_ADJUSTMENT,
+    LOANS_RECEIVABLE_GROSS, ALLOWANCE_CREDIT_LOSSES, UNEARNED_PRECOMPUTED_INTEREST,
+    UNEARNED_LIFE_INS, UNEARNED_AH_INS, ACCUMULATED_CHARGE_OFFS,
+    ACCRUED_EXPENSES, DPV_INTEREST,
+    PAYMENT_BANK, FUNDING_BANK, OPERATING_BANK, DPV_BANK,
+)
+from parsers.money import CENT, ZERO, to_decimal
+
+_BALANCE_TOLERANCE = Decimal("0.02")
+
+# Flattened INSURANCE_MAPPING: (ins_type, unearned_acct, earned_acct)
+_INSURANCE_ITEMS = tuple(
+    (ins_type, accts["unearned"], accts["earned"])
+    for ins_type, accts in INSURANCE_MAPPING.items()
+)
 
 
 @dataclass
@@ -26,7 +41,13 @@ class JournalEntryLine:
 
 @dataclass
 class JournalEntry:
-    """Complete journal entry with header and lines."""
+    """
+    Complete journal entry with header and lines.
+    Debit/credit totals are kept as running sums, so add lines through
+    add_line() / extend_lines() rather than mutating .lines directly.
+    total_debits / total_credits / is_balanced are then plain reads, so
+    there is no finalize() step and callers need not cache them.
+    """
     je_number: str           # e.g., "JE-1"
     description: str
     je_date: date
@@ -34,31 +55,61 @@ class JournalEntry:
     source_file: str = ""
     notes: str = ""
     review_required: bool = False
+    _dr_total: Decimal = field(default=Decimal("0"), init=False, repr=False, compare=False)
+    _cr_total: Decimal = field(default=Decimal("0"), init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._dr_total, self._cr_total = _sum_lines(self.lines)
 
     @property
     def total_debits(self) -> Decimal:
-        return sum(line.debit for line in self.lines)
+        return self._dr_total
 
     @property
     def total_credits(self) -> Decimal:
-        return sum(line.credit for line in self.lines)
+        return self._cr_total
 
     @property
     def is_balanced(self) -> bool:
-        return abs(self.total_debits - self.total_credits) < Decimal("0.02")
+        # Constant time: compares the running totals. Lines are summed once
+        # as they are added (exact Decimal), so there is no per-check
+        # reduction for a compiled int-cents kernel to speed up.
+        return abs(self._dr_total - self._cr_total) < _BALANCE_TOLERANCE
 
     def add_line(self, account_code: str, debit: Decimal = Decimal("0"),
                  credit: Decimal = Decimal("0"), memo: str = "",
                  class_name: str = ""):
+        debit, credit = to_decimal(debit), to_decimal(credit)
+        if not debit and not credit:
+            return  # Nothing to post (e.g. a fixed JE line whose amount is zero)
         name = ACCOUNT_NAMES.get(account_code, account_code)
-        self.lines.append(JournalEntryLine(
+        line = JournalEntryLine(
             account_code=account_code,
             account_name=name,
-            debit=_d(debit),
-            credit=_d(credit),
+            debit=debit,
+            credit=credit,
             memo=memo,
             class_name=class_name,
-        ))
+        )
+        self.lines.append(line)
+        self._dr_total += line.debit
+        self._cr_total += line.credit
+
+    def extend_lines(self, lines: list):
+        """Append already-built lines (e.g. from a per-class sub-entry)."""
+        dr, cr = _sum_lines(lines)
+        self.lines.extend(lines)
+        self._dr_total += dr
+        self._cr_total += cr
+
+
+def _sum_lines(lines) -> tuple[Decimal, Decimal]:
+    """Debit and credit totals of a list of lines in a single pass."""
+    dr = cr = Decimal("0")
+    for line in lines:
+        dr += line.debit
+        cr += line.credit
+    return dr, cr
 
 
 def generate_je1_finance_income(
@@ -122,24 +173,24 @@ def generate_je2_insurance_earnings(
         source_file="Unearned Register",
     )
 
-    for ins_type, mapping in INSURANCE_MAPPING.items():
-        prior = prior_unearned_insurance.get(ins_type, Decimal("0"))
-        current = current_unearned_insurance.get(ins_type, Decimal("0"))
+    for ins_type, unearned_acct, earned_acct in _INSURANCE_ITEMS:
+        prior = prior_unearned_insurance.get(ins_type, ZERO)
+        current = current_unearned_insurance.get(ins_type, ZERO)
         earned = prior - current
 
-        if earned != Decimal("0") and abs(earned) >= Decimal("0.01"):
+        if abs(earned) >= CENT:
             if earned > 0:
-                je.add_line(mapping["unearned"], debit=earned,
+                je.add_line(unearned_acct, debit=earned,
                             memo=f"Earned {ins_type} premium",
                             class_name=class_name)
-                je.add_line(mapping["earned"], credit=earned,
+                je.add_line(earned_acct, credit=earned,
                             memo=f"{ins_type} commission earned",
                             class_name=class_name)
             else:
-                je.add_line(mapping["earned"], debit=abs(earned),
+                je.add_line(earned_acct, debit=abs(earned),
                             memo=f"Reverse {ins_type} over-earned",
                             class_name=class_name)
-                je.add_line(mapping["unearned"], credit=abs(earned),
+                je.add_line(unearned_acct, credit=abs(earned),
                             memo=f"Increase unearned {ins_type}",
                             class_name=class_name)
 
@@ -486,10 +537,3 @@ def generate_je10_recoveries(
                     class_name=class_name)
 
     return je
-
-
-def _d(value) -> Decimal:
-    """Ensure Decimal with 2 decimal places."""
-    if isinstance(value, Decimal):
-        return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    return Decimal(str(round(float(value), 2))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
@@ -3,11 +3,21 @@ Parser for Charge Off Excel files.
 Reads Sheet2 (raw charge-off data) and produces summary metrics.
 """
 import pandas as pd
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from dataclasses import dataclass, field
+from typing import Optional
 
+from .excel_reader import read_sheet
+from .money import to_decimal
 
-@dataclass
+
+_NUMERIC_COLS = (
+    "NoteAmount", "PriorMonthBalance", "ChargeOffAmount",
+    "PCInterestRebate", "TotalChargeOffAmt",
+)
+
+
+@dataclass(slots=True)
 class ChargeOffSummary:
     """Aggregated charge-off metrics for the month."""
     note_amount: Decimal = Decimal("0")
@@ -20,6 +30,8 @@ class ChargeOffSummary:
     by_branch: dict = field(default_factory=dict)
     # By portfolio
     by_portfolio: dict = field(default_factory=dict)
+    # Set when net + unearned does not tie to the gross total
+    validation_warning: Optional[str] = None
 
 
 def parse_charge_offs(filepath: str) -> tuple[pd.DataFrame, ChargeOffSummary]:
@@ -27,53 +39,55 @@ def parse_charge_offs(filepath: str) -> tuple[pd.DataFrame, ChargeOffSummary]:
     Parse Charge Off Excel file.
     Returns (raw_dataframe, summary).
     """
-    df = pd.read_excel(filepath, sheet_name="Sheet2", engine="openpyxl")
-
-    numeric_cols = [
-        "NoteAmount", "PriorMonthBalance", "ChargeOffAmount",
-        "PCInterestRebate", "TotalChargeOffAmt"
-    ]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    df = read_sheet(filepath, sheet_name="Sheet2",
+                    numeric_cols=_NUMERIC_COLS)
 
+    totals = df[list(_NUMERIC_COLS)].sum().to_dict()
     summary = ChargeOffSummary(
-        note_amount=_to_decimal(df["NoteAmount"].sum()),
-        charge_off_amount=_to_decimal(df["ChargeOffAmount"].sum()),
-        pc_interest_rebate=_to_decimal(df["PCInterestRebate"].sum()),
-        total_charge_off_amt=_to_decimal(df["TotalChargeOffAmt"].sum()),
-        prior_month_balance=_to_decimal(df["PriorMonthBalance"].sum()),
+        note_amount=to_decimal(totals["NoteAmount"]),
+        charge_off_amount=to_decimal(totals["ChargeOffAmount"]),
+        pc_interest_rebate=to_decimal(totals["PCInterestRebate"]),
+        total_charge_off_amt=to_decimal(totals["TotalChargeOffAmt"]),
+        prior_month_balance=to_decimal(totals["PriorMonthBalance"]),
         account_count=len(df),
     )
 
     # Validation: net + unearned should = total
     expected_total = summary.charge_off_amount + summary.pc_interest_rebate
     if abs(expected_total - summary.total_charge_off_amt) > Decimal("1.00"):
-        summary._validation_warning = (
+        summary.validation_warning = (
             f"Net ({summary.charge_off_amount}) + Unearned ({summary.pc_interest_rebate}) "
             f"= {expected_total} vs Total ({summary.total_charge_off_amt})"
         )
 
-    # By branch
-    for branch_id, group in df.groupby("BranchID"):
-        summary.by_branch[int(branch_id)] = {
-            "charge_off_amount": _to_decimal(group["ChargeOffAmount"].sum()),
-            "pc_interest_rebate": _to_decimal(group["PCInterestRebate"].sum()),
-            "total_charge_off_amt": _to_decimal(group["TotalChargeOffAmt"].sum()),
-            "count": len(group),
+    # By branch (single groupby pass reducing every column at once)
+    by_branch = df.groupby("BranchID").agg(
+        charge_off_amount=("ChargeOffAmount", "sum"),
+        pc_interest_rebate=("PCInterestRebate", "sum"),
+        total_charge_off_amt=("TotalChargeOffAmt", "sum"),
+        rows=("ChargeOffAmount", "size"),
+    )
+    for row in by_branch.itertuples():
+        summary.by_branch[int(row.Index)] = {
+            "charge_off_amount": to_decimal(row.charge_off_amount),
+            "pc_interest_rebate": to_decimal(row.pc_interest_rebate),
+            "total_charge_off_amt": to_decimal(row.total_charge_off_amt),
+            "count": int(row.rows),
         }
 
     # By portfolio
-    for port_id, group in df.groupby("PortfolioID"):
-        summary.by_portfolio[int(port_id)] = {
-            "charge_off_amount": _to_decimal(group["ChargeOffAmount"].sum()),
-            "total_charge_off_amt": _to_decimal(group["TotalChargeOffAmt"].sum()),
-            "pc_interest_rebate": _to_decimal(group["PCInterestRebate"].sum()),
-            "count": len(group),
+    by_portfolio = df.groupby("PortfolioID").agg(
+        charge_off_amount=("ChargeOffAmount", "sum"),
+        total_charge_off_amt=("TotalChargeOffAmt", "sum"),
+        pc_interest_rebate=("PCInterestRebate", "sum"),
+        rows=("ChargeOffAmount", "size"),
+    )
+    for row in by_portfolio.itertuples():
+        summary.by_portfolio[int(row.Index)] = {
+            "charge_off_amount": to_decimal(row.charge_off_amount),
+            "total_charge_off_amt": to_decimal(row.total_charge_off_amt),
+            "pc_interest_rebate": to_decimal(row.pc_interest_rebate),
+            "count": int(row.rows),
         }
 
     return df, summary
-
-
-def _to_decimal(value) -> Decimal:
-    return Decimal(str(round(float(value), 2))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
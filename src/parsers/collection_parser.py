@@ -3,12 +3,22 @@ Parser for Collection Register Excel files.
 Reads Sheet2 (raw transaction data) and produces summary metrics.
 """
 import pandas as pd
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from dataclasses import dataclass, field
 from typing import Optional
 
+from .excel_reader import read_sheet
+from .money import to_decimal
 
-@dataclass
+
+_NUMERIC_COLS = (
+    "TotalCollected", "Principal", "InterestCollected", "InterestRebate",
+    "LateFees", "NSFFees", "InsuranceRebate", "BalanceRenewed",
+    "Recovery", "AmountToRefund", "AllotmentFee", "CashReceived",
+)
+
+
+@dataclass(slots=True)
 class CollectionSummary:
     """Aggregated collection metrics for the month."""
     total_collected: Decimal = Decimal("0")
@@ -36,68 +46,79 @@ def parse_collection_register(filepath: str) -> tuple[pd.DataFrame, CollectionSu
     Returns (raw_dataframe, summary).
     """
     # Read Sheet2 (raw data)
-    df = pd.read_excel(filepath, sheet_name="Sheet2", engine="openpyxl")
+    df = read_sheet(filepath, sheet_name="Sheet2",
+                    numeric_cols=_NUMERIC_COLS)
 
-    # Ensure numeric columns
-    numeric_cols = [
-        "TotalCollected", "Principal", "InterestCollected", "InterestRebate",
-        "LateFees", "NSFFees", "InsuranceRebate", "BalanceRenewed",
-        "Recovery", "AmountToRefund", "AllotmentFee", "CashReceived"
-    ]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-    # Build summary
+    # Build summary (one reduction across all numeric columns)
+    totals = df[list(_NUMERIC_COLS)].sum().to_dict()
     summary = CollectionSummary(
-        total_collected=_to_decimal(df["TotalCollected"].sum()),
-        principal=_to_decimal(df["Principal"].sum()),
-        interest_collected=_to_decimal(df["InterestCollected"].sum()),
-        interest_rebate=_to_decimal(df["InterestRebate"].sum()),
-        late_fees=_to_decimal(df["LateFees"].sum()),
-        nsf_fees=_to_decimal(df["NSFFees"].sum()),
-        insurance_rebate=_to_decimal(df["InsuranceRebate"].sum()),
-        balance_renewed=_to_decimal(df["BalanceRenewed"].sum()),
-        recovery=_to_decimal(df["Recovery"].sum()),
-        amount_to_refund=_to_decimal(df["AmountToRefund"].sum()),
-        allotment_fee=_to_decimal(df["AllotmentFee"].sum()),
-        cash_received=_to_decimal(df["CashReceived"].sum()),
+        total_collected=to_decimal(totals["TotalCollected"]),
+        principal=to_decimal(totals["Principal"]),
+        interest_collected=to_decimal(totals["InterestCollected"]),
+        interest_rebate=to_decimal(totals["InterestRebate"]),
+        late_fees=to_decimal(totals["LateFees"]),
+        nsf_fees=to_decimal(totals["NSFFees"]),
+        insurance_rebate=to_decimal(totals["InsuranceRebate"]),
+        balance_renewed=to_decimal(totals["BalanceRenewed"]),
+        recovery=to_decimal(totals["Recovery"]),
+        amount_to_refund=to_decimal(totals["AmountToRefund"]),
+        allotment_fee=to_decimal(totals["AllotmentFee"]),
+        cash_received=to_decimal(totals["CashReceived"]),
         transaction_count=len(df),
     )
 
-    # By branch
-    for branch_id, group in df.groupby("BranchID"):
-        summary.by_branch[int(branch_id)] = {
-            "total_collected": _to_decimal(group["TotalCollected"].sum()),
-            "principal": _to_decimal(group["Principal"].sum()),
-            "interest_collected": _to_decimal(group["InterestCollected"].sum()),
-            "late_fees": _to_decimal(group["LateFees"].sum()),
-            "nsf_fees": _to_decimal(group["NSFFees"].sum()),
-            "recovery": _to_decimal(group["Recovery"].sum()),
-            "cash_received": _to_decimal(group["CashReceived"].sum()),
-            "count": len(group),
+    # By branch (single groupby pass reducing every column at once)
+    by_branch = df.groupby("BranchID").agg(
+        total_collected=("TotalCollected", "sum"),
+        principal=("Principal", "sum"),
+        interest_collected=("InterestCollected", "sum"),
+        late_fees=("LateFees", "sum"),
+        nsf_fees=("NSFFees", "sum"),
+        recovery=("Recovery", "sum"),
+        cash_received=("CashReceived", "sum"),
+        rows=("TotalCollected", "size"),
+    )
+    for row in by_branch.itertuples():
+        summary.by_branch[int(row.Index)] = {
+            "total_collected": to_decimal(row.total_collected),
+            "principal": to_decimal(row.principal),
+            "interest_collected": to_decimal(row.interest_collected),
+            "late_fees": to_decimal(row.late_fees),
+            "nsf_fees": to_decimal(row.nsf_fees),
+            "recovery": to_decimal(row.recovery),
+            "cash_received": to_decimal(row.cash_received),
+            "count": int(row.rows),
         }
 
     # By portfolio
-    for port_id, group in df.groupby("PortfolioID"):
-        summary.by_portfolio[int(port_id)] = {
-            "total_collected": _to_decimal(group["TotalCollected"].sum()),
-            "principal": _to_decimal(group["Principal"].sum()),
-            "interest_collected": _to_decimal(group["InterestCollected"].sum()),
-            "interest_rebate": _to_decimal(group["InterestRebate"].sum()),
-            "late_fees": _to_decimal(group["LateFees"].sum()),
-            "nsf_fees": _to_decimal(group["NSFFees"].sum()),
-            "insurance_rebate": _to_decimal(group["InsuranceRebate"].sum()),
-            "balance_renewed": _to_decimal(group["BalanceRenewed"].sum()),
-            "recovery": _to_decimal(group["Recovery"].sum()),
-            "amount_to_refund": _to_decimal(group["AmountToRefund"].sum()),
-            "cash_received": _to_decimal(group["CashReceived"].sum()),
-            "count": len(group),
+    by_portfolio = df.groupby("PortfolioID").agg(
+        total_collected=("TotalCollected", "sum"),
+        principal=("Principal", "sum"),
+        interest_collected=("InterestCollected", "sum"),
+        interest_rebate=("InterestRebate", "sum"),
+        late_fees=("LateFees", "sum"),
+        nsf_fees=("NSFFees", "sum"),
+        insurance_rebate=("InsuranceRebate", "sum"),
+        balance_renewed=("BalanceRenewed", "sum"),
+        recovery=("Recovery", "sum"),
+        amount_to_refund=("AmountToRefund", "sum"),
+        cash_received=("CashReceived", "sum"),
+        rows=("TotalCollected", "size"),
+    )
+    for row in by_portfolio.itertuples():
+        summary.by_portfolio[int(row.Index)] = {
+            "total_collected": to_decimal(row.total_collected),
+            "principal": to_decimal(row.principal),
+            "interest_collected": to_decimal(row.interest_collected),
+            "interest_rebate": to_decimal(row.interest_rebate),
+            "late_fees": to_decimal(row.late_fees),
+            "nsf_fees": to_decimal(row.nsf_fees),
+            "insurance_rebate": to_decimal(row.insurance_rebate),
+            "balance_renewed": to_decimal(row.balance_renewed),
+            "recovery": to_decimal(row.recovery),
+            "amount_to_refund": to_decimal(row.amount_to_refund),
+            "cash_received": to_decimal(row.cash_received),
+            "count": int(row.rows),
         }
 
     return df, summary
-
-
-def _to_decimal(value) -> Decimal:
-    """Convert float to Decimal with 2 decimal places."""
-    return Decimal(str(round(float(value), 2))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
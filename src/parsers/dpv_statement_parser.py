@@ -2,11 +2,34 @@
 Parser for DPV LLC / Bank of America monthly invoices.
 Extracts interest expense and principal balance from PDF.
 """
+import numpy as np
 import pdfplumber
 import re
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from dataclasses import dataclass
 
+from .money import to_decimal
+
+# Compiled once at import; header patterns are applied page by page
+_INVOICE_DATE_RE = re.compile(r"InvoiceDate:\s*([\d\-A-Za-z]+)")
+_INVOICE_NUMBER_RE = re.compile(r"Invoice\s+([A-Z0-9]+)")
+_TOTAL_DUE_RE = re.compile(r"TotalDue:\s*USD\s*([\d,]+\.?\d*)")
+_INVOICE_DUE_DATE_RE = re.compile(r"InvoiceDueDate:\s*([\d\-A-Za-z]+)")
+_BALANCE_RE = re.compile(r"USD\s*([\d,]+\.?\d+)\s+USD")
+_INTEREST_PAYMENT_RE = re.compile(r"InterestPayment\s+([\d,]+\.?\d*)")
+
+# Above this many accrual lines the mode is taken with np.unique (one C pass)
+_NUMPY_MODE_MIN = 50
+
+# (field, pattern, is_money) — first match in page order wins
+_HEADER_FIELDS = (
+    ("invoice_date", _INVOICE_DATE_RE, False),
+    ("invoice_number", _INVOICE_NUMBER_RE, False),
+    ("total_due", _TOTAL_DUE_RE, True),
+    ("invoice_due_date", _INVOICE_DUE_DATE_RE, False),
+    ("interest_payment", _INTEREST_PAYMENT_RE, True),  # Mid-month payment
+)
+
 
 @dataclass
 class DPVStatementData:
@@ -30,50 +53,61 @@ def parse_dpv_statement(filepath: str) -> DPVStatementData:
     """Parse DPV LLC Bank of America PDF invoice."""
     data = DPVStatementData()
 
+    # Scan one page at a time so only the current page's text is held.
+    # Header fields stop being searched once found; accrual balances are
+    # collected from every page because the principal is their mode.
+    pending = list(_HEADER_FIELDS)
+    balances = []
     with pdfplumber.open(filepath) as pdf:
-        full_text = ""
         for page in pdf.pages:
             text = page.extract_text()
-            if text:
-                full_text += text + "\n"
-
-    # Extract invoice date
-    m = re.search(r"InvoiceDate:\s*([\d\-A-Za-z]+)", full_text)
-    if m:
-        data.invoice_date = m.group(1).strip()
-
-    # Extract invoice number
-    m = re.search(r"Invoice\s+([A-Z0-9]+)", full_text)
-    if m:
-        data.invoice_number = m.group(1).strip()
-
-    # Extract total due
-    m = re.search(r"TotalDue:\s*USD\s*([\d,]+\.?\d*)", full_text)
-    if m:
-        data.total_due = _to_decimal(Decimal(m.group(1).replace(",", "")))
-
-    # Extract due date
-    m = re.search(r"InvoiceDueDate:\s*([\d\-A-Za-z]+)", full_text)
-    if m:
-        data.invoice_due_date = m.group(1).strip()
-
-    # Extract principal balance (the accrued balance amount)
-    # Look for the recurring USD amount in accrual lines
-    balances = re.findall(r"USD\s*([\d,]+\.?\d+)\s+USD", full_text)
-    if balances:
-        # The most common balance is the principal
-        from collections import Counter
-        balance_counts = Counter(balances)
-        most_common = balance_counts.most_common(1)[0][0]
-        data.principal_balance = _to_decimal(Decimal(most_common.replace(",", "")))
-
-    # Extract interest payment (mid-month)
-    m = re.search(r"InterestPayment\s+([\d,]+\.?\d*)", full_text)
-    if m:
-        data.interest_payment = _to_decimal(Decimal(m.group(1).replace(",", "")))
+            if not text:
+                continue
+            if pending:
+                pending = _apply_header_patterns(text, data, pending)
+            # Look for the recurring USD amount in accrual lines
+            balances.extend(m.group(1) for m in _BALANCE_RE.finditer(text))
+
+    # Extract principal balance (the most common accrued balance amount)
+    most_common = _mode(balances)
+    if most_common is not None:
+        data.principal_balance = to_decimal(Decimal(most_common.replace(",", "")))
 
     return data
 
 
-def _to_decimal(value) -> Decimal:
-    return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+def _apply_header_patterns(text: str, data: DPVStatementData, pending: list) -> list:
+    """Fill any header fields matched on this page; return those still missing."""
+    still_pending = []
+    for name, pattern, is_money in pending:
+        m = pattern.search(text)
+        if not m:
+            still_pending.append((name, pattern, is_money))
+        elif is_money:
+            setattr(data, name, to_decimal(Decimal(m.group(1).replace(",", ""))))
+        else:
+            setattr(data, name, m.group(1).strip())
+    return still_pending
+
+
+def _mode(values: list):
+    """
+    Most frequent item (None if empty).
+    Ties go to the value seen first, same as Counter.most_common(1).
+    """
+    if len(values) > _NUMPY_MODE_MIN:
+        uniq, first_idx, counts = np.unique(
+            np.asarray(values), return_index=True, return_counts=True)
+        top = counts == counts.max()
+        return str(uniq[top][first_idx[top].argmin()])
+
+    counts = {}
+    first_seen = {}
+    best, best_n = None, 0
+    for i, value in enumerate(values):
+        n = counts[value] = counts.get(value, 0) + 1
+        if n == 1:
+            first_seen[value] = i
+        if n > best_n or (n == best_n and first_seen[value] < first_seen[best]):
+            best, best_n = value, n
+    return best
@@ -0,0 +1,105 @@
+"""
+Shared Excel reader for the register parsers.
+Memoizes parsed sheets as parquet snapshots keyed by file fingerprint,
+so reruns of the close skip the openpyxl parse entirely.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import python_calamine  # noqa: F401  (Rust reader, much faster than openpyxl)
+    ENGINE = "calamine"
+except ImportError:
+    ENGINE = "openpyxl"
+
+CACHE_DIR = Path.home() / ".cache" / "eom"
+
+# Set EOM_NO_CACHE=1 (or run_close.py --no-cache) to bypass every parse cache
+# and re-read all source files from scratch
+NO_CACHE_ENV = "EOM_NO_CACHE"
+
+
+def cache_enabled() -> bool:
+    """False when the EOM_NO_CACHE environment variable is set (non-empty, not "0")."""
+    return os.environ.get(NO_CACHE_ENV, "") in ("", "0")
+
+
+def read_sheet(filepath, sheet_name: str = "Sheet2",
+               numeric_cols=(), int_keys=()) -> pd.DataFrame:
+    """
+    Read one sheet of an Excel file, using the parquet cache when the
+    file is unchanged (same path, mtime and size) since the last read.
+
+    numeric_cols / int_keys are coerced (see coerce_numeric and
+    coerce_int_keys) before the snapshot is written, so a cache hit
+    comes back already typed and skips the casting pass too.
+    """
+    use_cache = cache_enabled()
+    key = _fingerprint(filepath, sheet_name, tuple(numeric_cols), tuple(int_keys))
+    cache_file = CACHE_DIR / f"{key}.parquet"
+    if use_cache and cache_file.exists():
+        try:
+            return pd.read_parquet(cache_file)
+        except Exception:
+            pass  # Corrupt or unreadable snapshot — fall through and re-parse
+
+    df = pd.read_excel(filepath, sheet_name=sheet_name, engine=ENGINE)
+    if numeric_cols:
+        df = coerce_numeric(df, numeric_cols)
+    if int_keys:
+        df = coerce_int_keys(df, int_keys)
+    if use_cache:
+        _write_cache(df, cache_file)
+    return df
+
+
+def coerce_numeric(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """
+    Coerce the given columns (those present) to numbers, blanks/text -> 0.
+    Done as one assign() so the frame is rebuilt once, not per column.
+    """
+    present = [c for c in columns if c in df.columns]
+    return df.assign(**{
+        c: pd.to_numeric(df[c], errors="coerce").fillna(0) for c in present
+    })
+
+
+def coerce_int_keys(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """
+    Cast ID columns used as groupby keys to nullable Int32 (blank -> <NA>),
+    which hash faster than the float64/object dtypes Excel reads give.
+    A column holding non-integral values is left as read.
+    """
+    casts = {}
+    for c in columns:
+        if c in df.columns:
+            try:
+                casts[c] = pd.to_numeric(df[c], errors="coerce").astype("Int32")
+            except (TypeError, ValueError):
+                pass
+    return df.assign(**casts) if casts else df
+
+
+def _fingerprint(filepath, sheet_name: str, numeric_cols: tuple = (),
+                 int_keys: tuple = ()) -> str:
+    """Cache key: blake2b of resolved path, sheet, mtime, size and coercions."""
+    path = Path(filepath).resolve()
+    stat = path.stat()
+    raw = (f"{path}:{sheet_name}:{stat.st_mtime_ns}:{stat.st_size}"
+           f":{','.join(numeric_cols)}:{','.join(int_keys)}")
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _write_cache(df: pd.DataFrame, cache_file: Path):
+    """Persist a snapshot atomically. Caching is best-effort: any failure
+    (pyarrow not installed, read-only home, mixed-type columns) is ignored."""
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(tmp, compression="zstd", index=False)
+        os.replace(tmp, cache_file)
+    except Exception:
+        tmp.unlink(missing_ok=True)
@@ -3,8 +3,20 @@ Parser for Loan Register Excel files.
 Reads Sheet2 (raw origination data) and produces summary metrics.
 """
 import pandas as pd
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from dataclasses import dataclass, field
+from functools import cached_property
+
+from .excel_reader import read_sheet
+from .money import to_decimal
+
+
+_NUMERIC_COLS = (
+    "NoteAmount", "FinanceCharge", "CashToBorrower",
+    "OriginalCreditLifePremium", "OriginalAndHPremium",
+    "APRFees", "BalanceRenewed", "PandIPaymentAmount",
+    "OriginalAcquisitionAmount",
+)
 
 
 @dataclass
@@ -18,12 +30,23 @@ class LoanRegisterSummary:
     apr_fees: Decimal = Decimal("0")
     balance_renewed: Decimal = Decimal("0")
     loan_count: int = 0
-    # By branch
-    by_branch: dict = field(default_factory=dict)
-    # By portfolio
-    by_portfolio: dict = field(default_factory=dict)
-    # By loan type
-    by_loan_type: dict = field(default_factory=dict)
+    # Breakdowns kept columnar (float sums + "count"), one row per group;
+    # the by_* properties below give the legacy dict-of-Decimal view.
+    by_branch_df: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+    by_portfolio_df: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+    by_loan_type_df: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+
+    @cached_property
+    def by_branch(self) -> dict:
+        return _frame_to_dict(self.by_branch_df, int)
+
+    @cached_property
+    def by_portfolio(self) -> dict:
+        return _frame_to_dict(self.by_portfolio_df, int)
+
+    @cached_property
+    def by_loan_type(self) -> dict:
+        return _frame_to_dict(self.by_loan_type_df, str)
 
 
 def parse_loan_register(filepath: str) -> tuple[pd.DataFrame, LoanRegisterSummary]:
@@ -31,65 +54,73 @@ def parse_loan_register(filepath: str) -> tuple[pd.DataFrame, LoanRegisterSummar
     Parse Loan Register Excel file.
     Returns (raw_dataframe, summary).
     """
-    df = pd.read_excel(filepath, sheet_name="Sheet2", engine="openpyxl")
-
-    numeric_cols = [
-        "NoteAmount", "FinanceCharge", "CashToBorrower",
-        "OriginalCreditLifePremium", "OriginalAndHPremium",
-        "APRFees", "BalanceRenewed", "PandIPaymentAmount",
-        "OriginalAcquisitionAmount"
-    ]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    df = read_sheet(filepath, sheet_name="Sheet2",
+                    numeric_cols=_NUMERIC_COLS,
+                    int_keys=("BranchID", "PortfolioID"))
+
+    # Portfolio breakdown first: the grand totals are the sum of its groups,
+    # so the register is only scanned once for both. dropna=False keeps
+    # rows with a blank PortfolioID in the totals.
+    by_portfolio = df.groupby("PortfolioID", dropna=False, sort=False, observed=True).agg(
+        note_amount=("NoteAmount", "sum"),
+        finance_charge=("FinanceCharge", "sum"),
+        cash_to_borrower=("CashToBorrower", "sum"),
+        credit_life_premium=("OriginalCreditLifePremium", "sum"),
+        ah_premium=("OriginalAndHPremium", "sum"),
+        apr_fees=("APRFees", "sum"),
+        balance_renewed=("BalanceRenewed", "sum"),
+        rows=("LoanNumber", "size"),
+    )
+    totals = by_portfolio.sum()
 
     summary = LoanRegisterSummary(
-        note_amount=_to_decimal(df["NoteAmount"].sum()),
-        finance_charge=_to_decimal(df["FinanceCharge"].sum()),
-        cash_to_borrower=_to_decimal(df["CashToBorrower"].sum()),
-        credit_life_premium=_to_decimal(df["OriginalCreditLifePremium"].sum()),
-        ah_premium=_to_decimal(df["OriginalAndHPremium"].sum()),
-        apr_fees=_to_decimal(df["APRFees"].sum()),
-        balance_renewed=_to_decimal(df["BalanceRenewed"].sum()),
+        note_amount=to_decimal(totals["note_amount"]),
+        finance_charge=to_decimal(totals["finance_charge"]),
+        cash_to_borrower=to_decimal(totals["cash_to_borrower"]),
+        credit_life_premium=to_decimal(totals["credit_life_premium"]),
+        ah_premium=to_decimal(totals["ah_premium"]),
+        apr_fees=to_decimal(totals["apr_fees"]),
+        balance_renewed=to_decimal(totals["balance_renewed"]),
         loan_count=len(df),
     )
 
-    # Check for duplicate loan numbers
-    dupes = df[df.duplicated(subset=["LoanNumber"], keep=False)]
-    if len(dupes) > 0:
-        summary._duplicate_loans = dupes["LoanNumber"].unique().tolist()
-
-    # By branch
-    for branch_id, group in df.groupby("BranchID"):
-        summary.by_branch[int(branch_id)] = {
-            "note_amount": _to_decimal(group["NoteAmount"].sum()),
-            "cash_to_borrower": _to_decimal(group["CashToBorrower"].sum()),
-            "finance_charge": _to_decimal(group["FinanceCharge"].sum()),
-            "count": len(group),
-        }
+    # Check for duplicate loan numbers (one hash pass, no row subset built)
+    loan_counts = df["LoanNumber"].value_counts(sort=False, dropna=False)
+    dupe_loans = loan_counts.index[loan_counts.to_numpy() > 1].tolist()
+    if dupe_loans:
+        summary._duplicate_loans = dupe_loans
 
-    # By portfolio
-    for port_id, group in df.groupby("PortfolioID"):
-        summary.by_portfolio[int(port_id)] = {
-            "note_amount": _to_decimal(group["NoteAmount"].sum()),
-            "finance_charge": _to_decimal(group["FinanceCharge"].sum()),
-            "cash_to_borrower": _to_decimal(group["CashToBorrower"].sum()),
-            "credit_life_premium": _to_decimal(group["OriginalCreditLifePremium"].sum()),
-            "ah_premium": _to_decimal(group["OriginalAndHPremium"].sum()),
-            "balance_renewed": _to_decimal(group["BalanceRenewed"].sum()),
-            "count": len(group),
-        }
+    # By branch (single groupby pass reducing every column at once)
+    summary.by_branch_df = df.groupby("BranchID", sort=False, observed=True).agg(
+        note_amount=("NoteAmount", "sum"),
+        cash_to_borrower=("CashToBorrower", "sum"),
+        finance_charge=("FinanceCharge", "sum"),
+        count=("LoanNumber", "size"),
+    )
+
+    # By portfolio (blank PortfolioID only counted in the totals)
+    summary.by_portfolio_df = by_portfolio.loc[
+        by_portfolio.index.notna(),
+        ["note_amount", "finance_charge", "cash_to_borrower",
+         "credit_life_premium", "ah_premium", "balance_renewed", "rows"],
+    ].rename(columns={"rows": "count"})
 
     # By loan type
-    for lt, group in df.groupby("LoanType"):
-        summary.by_loan_type[lt] = {
-            "note_amount": _to_decimal(group["NoteAmount"].sum()),
-            "finance_charge": _to_decimal(group["FinanceCharge"].sum()),
-            "count": len(group),
-        }
+    summary.by_loan_type_df = df.groupby("LoanType", sort=False, observed=True).agg(
+        note_amount=("NoteAmount", "sum"),
+        finance_charge=("FinanceCharge", "sum"),
+        count=("LoanNumber", "size"),
+    )
 
     return df, summary
 
 
-def _to_decimal(value) -> Decimal:
-    return Decimal(str(round(float(value), 2))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+def _frame_to_dict(frame: pd.DataFrame, key_type) -> dict:
+    """{group: {column: Decimal, ..., "count": int}} view of a breakdown frame."""
+    out = {}
+    for key, row in zip(frame.index.tolist(), frame.to_dict("records")):
+        out[key_type(key)] = {
+            col: int(val) if col == "count" else to_decimal(val)
+            for col, val in row.items()
+        }
+    return out
@@ -0,0 +1,25 @@
+"""
+Money helpers shared by the parsers and the JE engine.
+Every amount is rounded to cents ROUND_HALF_UP, exactly once, here.
+"""
+from decimal import Context, Decimal, ROUND_HALF_UP
+from functools import lru_cache
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+_CTX = Context(prec=28, rounding=ROUND_HALF_UP)
+
+
+def to_decimal(value) -> Decimal:
+    """Ensure Decimal with 2 decimal places."""
+    if not value:
+        return ZERO
+    if isinstance(value, Decimal):
+        return _CTX.quantize(value, CENT)
+    return float_to_cents(float(value))
+
+
+@lru_cache(maxsize=4096)
+def float_to_cents(value: float) -> Decimal:
+    """Memoized float -> 2dp Decimal; the same fee/premium amounts recur all run."""
+    return _CTX.quantize(Decimal(repr(value)), CENT)
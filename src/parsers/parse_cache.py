@@ -0,0 +1,110 @@
+"""
+Whole-parse cache for the Phase 1 source files.
+Stores a parser's result (DataFrame as parquet, summary as pickle) keyed by
+the source file fingerprint, so reruns on unchanged files skip the Excel
+read, summary aggregation and PDF text extraction entirely.
+
+The key also covers CACHE_VERSION and the source of every module under
+parsers/ and config/, so a change to a parser, to the shared reader or
+to portfolio/account config invalidates results parsed with the old code.
+"""
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from .excel_reader import CACHE_DIR, cache_enabled
+
+PARSE_CACHE_DIR = CACHE_DIR / "parsed"
+
+# Bump when a parser or summary dataclass changes in a way file mtimes would
+# not catch (e.g. a dependency outside parsers/ and config/)
+CACHE_VERSION = 1
+
+# Code the cached results depend on: the parsers themselves, the shared
+# Excel reader and the portfolio/account config
+_CODE_DIRS = (Path(__file__).resolve().parent,
+              Path(__file__).resolve().parent.parent / "config")
+
+
+def cached_parse(fn, filepath):
+    """
+    Return fn(filepath), served from the cache when the source file (and the
+    parser and config code that produced the cached result) are unchanged.
+    Results shaped (DataFrame, summary) store the frame as parquet; anything
+    else is pickled whole. Any cache failure falls back to a normal parse,
+    and with the cache disabled (EOM_NO_CACHE) fn is simply called.
+    """
+    if not cache_enabled():
+        return fn(filepath)
+    try:
+        key = _fingerprint(fn, filepath)
+    except OSError:
+        return fn(filepath)
+    frame_file = PARSE_CACHE_DIR / f"{key}.parquet"
+    result_file = PARSE_CACHE_DIR / f"{key}.pkl"
+
+    if result_file.exists():
+        try:
+            with open(result_file, "rb") as f:
+                result = pickle.load(f)
+            if frame_file.exists():
+                return pd.read_parquet(frame_file), result
+            return result
+        except Exception:
+            pass  # Corrupt or stale snapshot — fall through and re-parse
+
+    result = fn(filepath)
+    _write_cache(result, frame_file, result_file)
+    return result
+
+
+def _fingerprint(fn, filepath) -> str:
+    """Cache key: blake2b of CACHE_VERSION, the parser, the code stamp of
+    parsers/ and config/, and the file's path, mtime and size."""
+    path = Path(filepath).resolve()
+    stat = path.stat()
+    raw = (f"v{CACHE_VERSION}|{fn.__module__}.{fn.__qualname__}|{_code_stamp()}"
+           f"|{path}|{stat.st_mtime_ns}|{stat.st_size}")
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _code_stamp() -> str:
+    """Name, mtime and size of every .py file the parsers depend on; computed
+    once per process. Editing any of them invalidates every cached result."""
+    parts = []
+    for code_dir in _CODE_DIRS:
+        for module_file in sorted(code_dir.glob("*.py")):
+            st = module_file.stat()
+            parts.append(f"{module_file.parent.name}/{module_file.name}:{st.st_mtime_ns}:{st.st_size}")
+    return ";".join(parts)
+
+
+def _write_cache(result, frame_file: Path, result_file: Path):
+    """Persist a result atomically. Best-effort, like the sheet snapshots."""
+    suffix = f".{os.getpid()}.tmp"
+    frame_tmp = frame_file.with_suffix(suffix + ".parquet")
+    result_tmp = result_file.with_suffix(suffix)
+    try:
+        PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if (isinstance(result, tuple) and len(result) == 2
+                and isinstance(result[0], pd.DataFrame)):
+            df, payload = result
+            df.to_parquet(frame_tmp, compression="zstd", index=False)
+        else:
+            payload = result
+        with open(result_tmp, "wb") as f:
+            pickle.dump(payload, f, protocol=5)
+        # The pickle is the presence marker, so it is moved into place last
+        if frame_tmp.exists():
+            os.replace(frame_tmp, frame_file)
+        else:
+            frame_file.unlink(missing_ok=True)
+        os.replace(result_tmp, result_file)
+    except Exception:
+        frame_tmp.unlink(missing_ok=True)
+        result_tmp.unlink(missing_ok=True)
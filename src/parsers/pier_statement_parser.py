@@ -4,9 +4,61 @@ Extracts key facility data from PDF.
 """
 import pdfplumber
 import re
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from dataclasses import dataclass
 
+# Compiled once at import
+_BORROWER_RE = re.compile(r"Borrower:\s*(.+?)(?:\n|Reporting)")
+_PERIOD_RE = re.compile(r"period:\s*(.+?)(?:\n|Days)")
+_RATE_RE = re.compile(r"Interest:\s*([\d.]+)%\s*\+\s*SOFR\s*\(([\d.]+)%\s*floor\)")
+_DAILY_ACCRUAL_RE = re.compile(r"\d{1,2}/\d{1,2}/\d{4}\s+[\d.]+%\s+\$([\d,]+\.?\d*)")
+
+# Key financial figures: (field, label, may_be_dash). Advances and payments
+# print "-" when there were none; that counts as found, with no amount.
+_MONEY_FIELDS = (
+    ("beginning_balance", "Beginning Balance", False),
+    ("ending_balance", "Ending Balance", False),
+    ("accrued_interest_due", "Accrued Interest Due", False),
+    ("origination_fee_outstanding", "Origination Fee Outstanding", False),
+    ("default_reserve_balance_due", "Default Reserve Balance Due", False),
+    ("total_amount_due", "Total Amount Due", False),
+    ("advances", "Advances in Period", True),
+    ("principal_payments", "Principal Payments in Period", True),
+)
+# One alternation so the text is scanned once for every figure
+_MONEY_RE = re.compile("|".join(
+    rf"(?P<{name}>{label}\s+\$?(?P<{name}_val>[\d,]+\.?\d*{'|-' if may_be_dash else ''}))"
+    for name, label, may_be_dash in _MONEY_FIELDS
+))
+
+
+def _money(text: str) -> Decimal:
+    """Statement amount ("1,234.567") -> Decimal rounded half-up to cents."""
+    return Decimal(_money_to_cents(text)).scaleb(-2)
+
+
+def _money_to_cents(text: str) -> int:
+    """
+    Parse the unsigned "1,234.56" shape the money regexes capture straight
+    to integer cents, rounding half-up on the third decimal digit.
+    """
+    whole, _, frac = text.replace(",", "").partition(".")
+    cents = int(whole or "0") * 100 + int((frac + "00")[:2])
+    if frac[2:3] >= "5":
+        cents += 1
+    return cents
+
+
+# Single-capture fields: (field, regex, converter for group 1)
+_SCALAR_FIELDS = (
+    ("borrower", _BORROWER_RE, str.strip),
+    ("reporting_period", _PERIOD_RE, str.strip),
+    ("daily_accrual_rate", _DAILY_ACCRUAL_RE, _money),
+)
+
+# interest_rate (base + floor) + scalar fields + money fields
+_FIELD_COUNT = 1 + len(_SCALAR_FIELDS) + len(_MONEY_FIELDS)
+
 
 @dataclass
 class PierStatementData:
@@ -30,61 +82,43 @@ def parse_pier_statement(filepath: str) -> PierStatementData:
     """Parse Pier facility PDF statement."""
     data = PierStatementData()
 
+    # Scan page by page and stop as soon as every field has been found;
+    # the header and balances are normally all on the first page or two.
+    found = set()
     with pdfplumber.open(filepath) as pdf:
-        full_text = ""
         for page in pdf.pages:
             text = page.extract_text()
             if text:
-                full_text += text + "\n"
-
-    # Extract borrower
-    m = re.search(r"Borrower:\s*(.+?)(?:\n|Reporting)", full_text)
-    if m:
-        data.borrower = m.group(1).strip()
-
-    # Extract reporting period
-    m = re.search(r"period:\s*(.+?)(?:\n|Days)", full_text)
-    if m:
-        data.reporting_period = m.group(1).strip()
-
-    # Extract interest rate
-    m = re.search(r"Interest:\s*([\d.]+)%\s*\+\s*SOFR\s*\(([\d.]+)%\s*floor\)", full_text)
-    if m:
-        data.interest_rate_base = Decimal(m.group(1))
-        data.sofr_floor = Decimal(m.group(2))
-
-    # Extract key financial figures
-    patterns = {
-        "beginning_balance": r"Beginning Balance\s+\$?([\d,]+\.?\d*)",
-        "ending_balance": r"Ending Balance\s+\$?([\d,]+\.?\d*)",
-        "accrued_interest_due": r"Accrued Interest Due\s+\$?([\d,]+\.?\d*)",
-        "origination_fee_outstanding": r"Origination Fee Outstanding\s+\$?([\d,]+\.?\d*)",
-        "default_reserve_balance_due": r"Default Reserve Balance Due\s+\$?([\d,]+\.?\d*)",
-        "total_amount_due": r"Total Amount Due\s+\$?([\d,]+\.?\d*)",
-    }
-
-    for field_name, pattern in patterns.items():
-        m = re.search(pattern, full_text)
-        if m:
-            value = m.group(1).replace(",", "")
-            setattr(data, field_name, _to_decimal(Decimal(value)))
-
-    # Check for advances/payments (may show as "-")
-    m = re.search(r"Advances in Period\s+[\$]?([\d,]+\.?\d*|-)", full_text)
-    if m and m.group(1) != "-":
-        data.advances = _to_decimal(Decimal(m.group(1).replace(",", "")))
-
-    m = re.search(r"Principal Payments in Period\s+[\$]?([\d,]+\.?\d*|-)", full_text)
-    if m and m.group(1) != "-":
-        data.principal_payments = _to_decimal(Decimal(m.group(1).replace(",", "")))
-
-    # Extract daily accrual from the daily schedule
-    m = re.search(r"\d{1,2}/\d{1,2}/\d{4}\s+[\d.]+%\s+\$([\d,]+\.?\d*)", full_text)
-    if m:
-        data.daily_accrual_rate = _to_decimal(Decimal(m.group(1).replace(",", "")))
+                _scan_page(text + "\n", data, found)
+                if len(found) == _FIELD_COUNT:
+                    break
 
     return data
 
 
-def _to_decimal(value) -> Decimal:
-    return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+def _scan_page(text: str, data: PierStatementData, found: set):
+    """Fill any fields not yet in `found` from one page of statement text."""
+    for field_name, rx, convert in _SCALAR_FIELDS:
+        if field_name not in found:
+            m = rx.search(text)
+            if m:
+                setattr(data, field_name, convert(m.group(1)))
+                found.add(field_name)
+
+    # Interest rate: base spread and SOFR floor from one match
+    if "interest_rate" not in found:
+        m = _RATE_RE.search(text)
+        if m:
+            data.interest_rate_base = Decimal(m.group(1))
+            data.sofr_floor = Decimal(m.group(2))
+            found.add("interest_rate")
+
+    # Key financial figures (first occurrence of each wins)
+    for m in _MONEY_RE.finditer(text):
+        field_name = m.lastgroup
+        if field_name in found:
+            continue
+        found.add(field_name)
+        value = m.group(f"{field_name}_val")
+        if value != "-":
+            setattr(data, field_name, _money(value))
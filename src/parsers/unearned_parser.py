@@ -4,8 +4,28 @@ Reads Sheet2 (loan-level unearned income schedule) and produces summary metrics.
 This is the most critical file — it drives finance income recognition and insurance earnings.
 """
 import pandas as pd
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from dataclasses import dataclass, field
+from functools import cached_property
+
+from .excel_reader import read_sheet
+from .money import to_decimal
+
+
+_NUMERIC_COLS = (
+    "CurrentBalance", "OriginalFinanceCharge",
+    "InterestCollectedMonth", "InterestCollectedToDate",
+    "UnearnedNewInterest", "UnearnedExistingInterest",
+    "UnearnedNewFinanceFees", "UnearnedExistingFinanceFees",
+    "UnearnedNewCreditLife", "UnearnedExistingCreditLife",
+    "UnearnedNewDisability", "UnearnedExistingDisability",
+    "UnearnedNewIUI", "UnearnedExistingIUI",
+    "UnearnedNewProperty", "UnearnedExistingProperty",
+    "UnearnedNewVSI", "UnearnedExistingVSI",
+    "OriginalCreditLife", "OriginalDisability", "OriginalIUI",
+    "OriginalProperty", "OriginalVSI", "OriginalFinanceFees",
+    "AmountFinanced",
+)
 
 
 @dataclass
@@ -35,10 +55,18 @@ class UnearnedSummary:
     interest_collected_month: Decimal = Decimal("0")
     loan_count: int = 0
 
-    # By branch
-    by_branch: dict = field(default_factory=dict)
-    # By portfolio
-    by_portfolio: dict = field(default_factory=dict)
+    # Breakdowns kept columnar (float sums + "count"), one row per group;
+    # Decimals are only built when the by_* dict views are first read.
+    by_branch_df: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+    by_portfolio_df: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+
+    @cached_property
+    def by_branch(self) -> dict:
+        return _frame_to_dict(self.by_branch_df)
+
+    @cached_property
+    def by_portfolio(self) -> dict:
+        return _frame_to_dict(self.by_portfolio_df)
 
 
 def parse_unearned_register(filepath: str) -> tuple[pd.DataFrame, UnearnedSummary]:
@@ -46,39 +74,48 @@ def parse_unearned_register(filepath: str) -> tuple[pd.DataFrame, UnearnedSummar
     Parse Unearned Register Excel file.
     Returns (raw_dataframe, summary).
     """
-    df = pd.read_excel(filepath, sheet_name="Sheet2", engine="openpyxl")
-
-    numeric_cols = [
-        "CurrentBalance", "OriginalFinanceCharge",
-        "InterestCollectedMonth", "InterestCollectedToDate",
-        "UnearnedNewInterest", "UnearnedExistingInterest",
-        "UnearnedNewFinanceFees", "UnearnedExistingFinanceFees",
-        "UnearnedNewCreditLife", "UnearnedExistingCreditLife",
-        "UnearnedNewDisability", "UnearnedExistingDisability",
-        "UnearnedNewIUI", "UnearnedExistingIUI",
-        "UnearnedNewProperty", "UnearnedExistingProperty",
-        "UnearnedNewVSI", "UnearnedExistingVSI",
-        "OriginalCreditLife", "OriginalDisability", "OriginalIUI",
-        "OriginalProperty", "OriginalVSI", "OriginalFinanceFees",
-        "AmountFinanced",
-    ]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    df = read_sheet(filepath, sheet_name="Sheet2",
+                    numeric_cols=_NUMERIC_COLS,
+                    int_keys=("BranchId", "PortfolioId"))
+
+    # Portfolio breakdown first: the grand totals are the sum of its groups,
+    # so the register is only scanned once for both. dropna=False keeps
+    # rows with a blank PortfolioId in the totals.
+    by_portfolio = df.groupby("PortfolioId", dropna=False, sort=False, observed=True).agg(
+        new_int=("UnearnedNewInterest", "sum"),
+        exist_int=("UnearnedExistingInterest", "sum"),
+        new_ff=("UnearnedNewFinanceFees", "sum"),
+        exist_ff=("UnearnedExistingFinanceFees", "sum"),
+        current_balance=("CurrentBalance", "sum"),
+        original_finance_charge=("OriginalFinanceCharge", "sum"),
+        new_life=("UnearnedNewCreditLife", "sum"),
+        exist_life=("UnearnedExistingCreditLife", "sum"),
+        new_disability=("UnearnedNewDisability", "sum"),
+        exist_disability=("UnearnedExistingDisability", "sum"),
+        new_iui=("UnearnedNewIUI", "sum"),
+        exist_iui=("UnearnedExistingIUI", "sum"),
+        new_property=("UnearnedNewProperty", "sum"),
+        exist_property=("UnearnedExistingProperty", "sum"),
+        new_vsi=("UnearnedNewVSI", "sum"),
+        exist_vsi=("UnearnedExistingVSI", "sum"),
+        interest_collected_month=("InterestCollectedMonth", "sum"),
+        rows=("CurrentBalance", "size"),
+    )
+    totals = by_portfolio.sum()
 
     # Compute totals
-    unearned_new_int = _to_decimal(df["UnearnedNewInterest"].sum())
-    unearned_exist_int = _to_decimal(df["UnearnedExistingInterest"].sum())
+    unearned_new_int = to_decimal(totals["new_int"])
+    unearned_exist_int = to_decimal(totals["exist_int"])
 
-    unearned_new_ff = _to_decimal(df["UnearnedNewFinanceFees"].sum())
-    unearned_exist_ff = _to_decimal(df["UnearnedExistingFinanceFees"].sum())
+    unearned_new_ff = to_decimal(totals["new_ff"])
+    unearned_exist_ff = to_decimal(totals["exist_ff"])
 
     # Insurance unearned (new + existing for each type)
-    ue_life = _to_decimal(df["UnearnedNewCreditLife"].sum() + df["UnearnedExistingCreditLife"].sum())
-    ue_disability = _to_decimal(df["UnearnedNewDisability"].sum() + df["UnearnedExistingDisability"].sum())
-    ue_iui = _to_decimal(df["UnearnedNewIUI"].sum() + df["UnearnedExistingIUI"].sum())
-    ue_property = _to_decimal(df["UnearnedNewProperty"].sum() + df["UnearnedExistingProperty"].sum())
-    ue_vsi = _to_decimal(df["UnearnedNewVSI"].sum() + df["UnearnedExistingVSI"].sum())
+    ue_life = to_decimal(totals["new_life"] + totals["exist_life"])
+    ue_disability = to_decimal(totals["new_disability"] + totals["exist_disability"])
+    ue_iui = to_decimal(totals["new_iui"] + totals["exist_iui"])
+    ue_property = to_decimal(totals["new_property"] + totals["exist_property"])
+    ue_vsi = to_decimal(totals["new_vsi"] + totals["exist_vsi"])
 
     summary = UnearnedSummary(
         unearned_new_interest=unearned_new_int,
@@ -93,40 +130,50 @@ def parse_unearned_register(filepath: str) -> tuple[pd.DataFrame, UnearnedSummar
         unearned_property=ue_property,
         unearned_vsi=ue_vsi,
         total_unearned_insurance=ue_life + ue_disability + ue_iui + ue_property + ue_vsi,
-        total_current_balance=_to_decimal(df["CurrentBalance"].sum()),
-        original_finance_charge=_to_decimal(df["OriginalFinanceCharge"].sum()),
-        interest_collected_month=_to_decimal(df["InterestCollectedMonth"].sum()),
+        total_current_balance=to_decimal(totals["current_balance"]),
+        original_finance_charge=to_decimal(totals["original_finance_charge"]),
+        interest_collected_month=to_decimal(totals["interest_collected_month"]),
         loan_count=len(df),
     )
 
-    # By branch
-    for branch_id, group in df.groupby("BranchId"):
-        branch_int = int(branch_id)
-        ue_int = _to_decimal(group["UnearnedNewInterest"].sum() + group["UnearnedExistingInterest"].sum())
-        summary.by_branch[branch_int] = {
-            "total_unearned_interest": ue_int,
-            "current_balance": _to_decimal(group["CurrentBalance"].sum()),
-            "count": len(group),
-        }
-
-    # By portfolio
-    for port_id, group in df.groupby("PortfolioId"):
-        port_int = int(port_id)
-        ue_int = _to_decimal(group["UnearnedNewInterest"].sum() + group["UnearnedExistingInterest"].sum())
-        summary.by_portfolio[port_int] = {
-            "total_unearned_interest": ue_int,
-            "current_balance": _to_decimal(group["CurrentBalance"].sum()),
-            "unearned_credit_life": _to_decimal(group["UnearnedNewCreditLife"].sum() + group["UnearnedExistingCreditLife"].sum()),
-            "unearned_disability": _to_decimal(group["UnearnedNewDisability"].sum() + group["UnearnedExistingDisability"].sum()),
-            "unearned_iui": _to_decimal(group["UnearnedNewIUI"].sum() + group["UnearnedExistingIUI"].sum()),
-            "unearned_property": _to_decimal(group["UnearnedNewProperty"].sum() + group["UnearnedExistingProperty"].sum()),
-            "unearned_vsi": _to_decimal(group["UnearnedNewVSI"].sum() + group["UnearnedExistingVSI"].sum()),
-            "interest_collected_month": _to_decimal(group["InterestCollectedMonth"].sum()),
-            "count": len(group),
-        }
+    # By branch (single groupby pass reducing every column at once). The
+    # sums run in pandas' compiled groupby kernels over the Int32 keys, so a
+    # JIT'd reduction would not buy anything at register sizes.
+    by_branch = df.groupby("BranchId", sort=False, observed=True).agg(
+        new_int=("UnearnedNewInterest", "sum"),
+        exist_int=("UnearnedExistingInterest", "sum"),
+        current_balance=("CurrentBalance", "sum"),
+        rows=("CurrentBalance", "size"),
+    )
+    summary.by_branch_df = pd.DataFrame({
+        "total_unearned_interest": by_branch["new_int"] + by_branch["exist_int"],
+        "current_balance": by_branch["current_balance"],
+        "count": by_branch["rows"],
+    })
+
+    # By portfolio (blank PortfolioId only counted in the totals)
+    ports = by_portfolio[by_portfolio.index.notna()]
+    summary.by_portfolio_df = pd.DataFrame({
+        "total_unearned_interest": ports["new_int"] + ports["exist_int"],
+        "current_balance": ports["current_balance"],
+        "unearned_credit_life": ports["new_life"] + ports["exist_life"],
+        "unearned_disability": ports["new_disability"] + ports["exist_disability"],
+        "unearned_iui": ports["new_iui"] + ports["exist_iui"],
+        "unearned_property": ports["new_property"] + ports["exist_property"],
+        "unearned_vsi": ports["new_vsi"] + ports["exist_vsi"],
+        "interest_collected_month": ports["interest_collected_month"],
+        "count": ports["rows"],
+    })
 
     return df, summary
 
 
-def _to_decimal(value) -> Decimal:
-    return Decimal(str(round(float(value), 2))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+def _frame_to_dict(frame: pd.DataFrame) -> dict:
+    """{id: {column: Decimal, ..., "count": int}} view of a breakdown frame."""
+    out = {}
+    for key, row in zip(frame.index.tolist(), frame.to_dict("records")):
+        out[int(key)] = {
+            col: int(val) if col == "count" else to_decimal(val)
+            for col, val in row.items()
+        }
+    return out
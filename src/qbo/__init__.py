@@ -3,8 +3,20 @@ QuickBooks Online MCP Integration
 ----------------------------------
 Provides MCP tools for pulling QBO financial data and merging
 with Nortridge portfolio metrics for modeling and forecasting.
+
+Exports are resolved lazily (PEP 562) so that importing the auth module
+alone (e.g. setup_oauth.py) does not pull in pandas via the client.
 """
-from .client import QBOClient
-from .auth import QBOAuth
+from importlib import import_module
 
 __all__ = ["QBOClient", "QBOAuth"]
+
+_EXPORTS = {"QBOClient": ".client", "QBOAuth": ".auth"}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
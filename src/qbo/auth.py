@@ -14,14 +14,19 @@ per Intuit's security requirements.
 """
 import os
 import json
+import logging
+import threading
 import time
 import secrets
+from functools import lru_cache
 from urllib.parse import urlencode
 from pathlib import Path
 
 import requests
 from requests.auth import HTTPBasicAuth
 
+log = logging.getLogger("qbo.auth")
+
 # Intuit discovery document — provides latest OAuth 2.0 endpoints
 DISCOVERY_DOC_URL = "https://developer.intuit.com/.well-known/openid_configuration"
 
@@ -32,20 +37,52 @@ SCOPES = [
 
 TOKEN_FILE = Path(__file__).parent.parent.parent / "tokens.json"  # gitignored
 
+# On-disk copy of the discovery document, shared by short-lived CLI runs.
+# Kept with the other caches under ~/.cache/eom, outside the repo.
+DISCOVERY_CACHE_FILE = Path.home() / ".cache" / "eom" / "qbo_discovery.json"
+DISCOVERY_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Keep-alive connection for discovery fetches (free function, so module-level)
+_discovery_session = requests.Session()
+
 # Errors that mean the refresh token is invalid — user must re-authorize
 _REAUTH_ERRORS = {"invalid_grant", "AuthenticationFailed", "token_expired"}
 
+# Start a background refresh this long before the access token expires
+REFRESH_AHEAD_SECONDS = 5 * 60
+
 
+@lru_cache(maxsize=1)
 def _load_discovery() -> dict:
     """
     Fetch Intuit's OpenID discovery document to get current OAuth endpoints.
-    Cached in memory for the process lifetime.
+    Cached on disk for 24h and in memory for the process lifetime. If the
+    fetch fails, a stale disk copy is used; with no copy at all, returns {}
+    and the endpoint properties fall back to their built-in defaults.
     """
-    if not hasattr(_load_discovery, "_cache"):
-        resp = requests.get(DISCOVERY_DOC_URL, timeout=10)
+    cached = None
+    try:
+        cached = json.loads(DISCOVERY_CACHE_FILE.read_text())
+        if time.time() - DISCOVERY_CACHE_FILE.stat().st_mtime < DISCOVERY_CACHE_TTL:
+            return cached
+    except (OSError, ValueError):
+        pass
+
+    try:
+        resp = _discovery_session.get(DISCOVERY_DOC_URL, timeout=10)
         resp.raise_for_status()
-        _load_discovery._cache = resp.json()
-    return _load_discovery._cache
+        doc = resp.json()
+    except (requests.RequestException, ValueError):
+        return cached or {}
+
+    try:
+        DISCOVERY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = DISCOVERY_CACHE_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(doc))
+        tmp.replace(DISCOVERY_CACHE_FILE)
+    except OSError:
+        pass  # Cache is best-effort
+    return doc
 
 
 class TokenExpiredError(Exception):
@@ -62,6 +99,13 @@ class QBOAuth:
         self._realm_id = os.environ.get("QBO_REALM_ID", "")
         self._tokens: dict = {}
         self._csrf_state: str = ""
+        # Serializes token refreshes (caller thread vs. background refresh)
+        self._lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+        # One keep-alive session for all token endpoint calls
+        self._session = requests.Session()
+        self._session.auth = HTTPBasicAuth(self.client_id, self.client_secret)
+        self._session.headers["Accept"] = "application/json"
         self._load_tokens()
 
     # ------------------------------------------------------------------
@@ -107,10 +151,12 @@ class QBOAuth:
             }
 
     def _save_tokens(self):
-        """Persist tokens to gitignored file."""
+        """Persist tokens to gitignored file (temp file + rename, so atomic)."""
         TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(TOKEN_FILE, "w") as f:
+        tmp = TOKEN_FILE.with_suffix(".tmp")
+        with open(tmp, "w") as f:
             json.dump(self._tokens, f, indent=2)
+        os.replace(tmp, TOKEN_FILE)
 
     # ------------------------------------------------------------------
     # Authorization flow
@@ -146,10 +192,8 @@ class QBOAuth:
         if state:
             self.validate_csrf_state(state)
 
-        resp = requests.post(
+        resp = self._session.post(
             self._token_endpoint,
-            auth=HTTPBasicAuth(self.client_id, self.client_secret),
-            headers={"Accept": "application/json"},
             data={
                 "grant_type": "authorization_code",
                 "code": authorization_code,
@@ -178,10 +222,8 @@ class QBOAuth:
         Raises TokenExpiredError if the refresh token is invalid/expired,
         prompting the user to re-authorize via setup_oauth.py.
         """
-        resp = requests.post(
+        resp = self._session.post(
             self._token_endpoint,
-            auth=HTTPBasicAuth(self.client_id, self.client_secret),
-            headers={"Accept": "application/json"},
             data={
                 "grant_type": "refresh_token",
                 "refresh_token": self._tokens["refresh_token"],
@@ -190,12 +232,35 @@ class QBOAuth:
         )
         self._handle_token_response(resp)
         data = resp.json()
-        self._tokens["access_token"] = data["access_token"]
-        self._tokens["refresh_token"] = data.get(
-            "refresh_token", self._tokens["refresh_token"]
-        )
-        self._tokens["expiry"] = time.time() + data.get("expires_in", 3600) - 60
-        self._save_tokens()
+        old_tokens = self._tokens
+        # Swap in a new dict so readers never see a half-updated token set
+        self._tokens = {
+            **old_tokens,
+            "access_token": data["access_token"],
+            "refresh_token": data.get("refresh_token", old_tokens["refresh_token"]),
+            "expiry": time.time() + data.get("expires_in", 3600) - 60,
+        }
+        # Persist the fresh access token and expiry too, so the next process
+        # starts with a valid token instead of a refresh round-trip. The write
+        # is skipped only when the response changed nothing.
+        changed = (self._tokens["access_token"] != old_tokens.get("access_token")
+                   or self._tokens["refresh_token"] != old_tokens["refresh_token"])
+        if changed or not TOKEN_FILE.exists():
+            self._save_tokens()
+
+    def _background_refresh(self):
+        """
+        Proactive refresh run off the caller's thread. Failures are logged
+        and left for the synchronous path in access_token to retry and raise
+        once the current token actually expires.
+        """
+        with self._lock:
+            if time.time() < self._tokens.get("expiry", 0) - REFRESH_AHEAD_SECONDS:
+                return  # Someone else already refreshed
+            try:
+                self._refresh()
+            except Exception:
+                log.warning("Background QBO token refresh failed", exc_info=True)
 
     def _handle_token_response(self, resp: requests.Response):
         """
@@ -226,13 +291,29 @@ class QBOAuth:
 
     @property
     def access_token(self) -> str:
-        """Return a valid access token, refreshing automatically if expired."""
+        """
+        Return a valid access token, refreshing automatically if expired.
+        Within REFRESH_AHEAD_SECONDS of expiry the refresh is started in a
+        background thread and the still-valid current token is returned.
+        """
         if not self._tokens.get("access_token"):
             raise RuntimeError(
                 "No QBO access token. Run: python src/qbo/setup_oauth.py"
             )
-        if time.time() >= self._tokens.get("expiry", 0):
-            self._refresh()
+        remaining = self._tokens.get("expiry", 0) - time.time()
+        if remaining <= 0:
+            with self._lock:
+                # Re-check: a background refresh may have finished meanwhile
+                if time.time() >= self._tokens.get("expiry", 0):
+                    self._refresh()
+        elif remaining < REFRESH_AHEAD_SECONDS:
+            token = self._tokens["access_token"]
+            if not (self._refresh_thread and self._refresh_thread.is_alive()):
+                self._refresh_thread = threading.Thread(
+                    target=self._background_refresh, daemon=True
+                )
+                self._refresh_thread.start()
+            return token
         return self._tokens["access_token"]
 
     @property
@@ -249,10 +330,8 @@ class QBOAuth:
         if not token:
             print("[QBOAuth] No tokens to revoke.")
             return
-        resp = requests.post(
+        resp = self._session.post(
             self._revoke_endpoint,
-            auth=HTTPBasicAuth(self.client_id, self.client_secret),
-            headers={"Accept": "application/json"},
             json={"token": token},
             timeout=30,
         )
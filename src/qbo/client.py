@@ -11,54 +11,199 @@ Error handling:
 - Validation errors: 400 responses parsed and logged with detail
 """
 import os
+import atexit
+import hashlib
+import json
 import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson  # Rust JSON decoder, several times faster on big GL payloads
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from .auth import QBOAuth
 
 QBO_BASE = "https://quickbooks.api.intuit.com/v3/company"
 SANDBOX_BASE = "https://sandbox-quickbooks.api.intuit.com/v3/company"
 
+# QBO allows at most 10 concurrent requests per realm; beyond that it
+# answers 429. Concurrent report pulls (e.g. the MCP month-end bundle)
+# queue here instead of tripping the throttle.
+MAX_CONCURRENT_REQUESTS = 10
+
+# In-process response cache (LRU, per-entry TTL). Reports for a closed
+# month don't change, the chart of accounts rarely does; anything else is
+# only reused briefly. A period counts as closed only when it ends on or
+# before QBO_CLOSED_THROUGH (YYYY-MM-DD) — the month being closed is still
+# taking JEs, so it is never long-cached by date alone.
+CACHE_MAXSIZE = 256
+CLOSED_PERIOD_TTL = 24 * 60 * 60
+CHART_OF_ACCOUNTS_TTL = 5 * 60
+CURRENT_PERIOD_TTL = 30
+
+# Set EOM_NO_CACHE=1 (same switch as the parser caches) to bypass every
+# response cache and always hit QBO
+NO_CACHE_ENV = "EOM_NO_CACHE"
+
+# Parsed closed-period reports are also kept on disk as parquet, so reruns
+# of the close (new processes) skip the QBO round-trip entirely. Lives with
+# the parser caches under ~/.cache/eom, outside the repo.
+_CACHE_DIR = Path.home() / ".cache" / "eom" / "qbo"
+
 # ------------------------------------------------------------------
-# Logging — errors written to logs/qbo.log for Intuit troubleshooting
+# Logging — errors written to logs/qbo.log for Intuit troubleshooting.
+# Request threads only enqueue records; a background listener owns the
+# file/stream handlers, so disk writes stay off the HTTP path.
 # ------------------------------------------------------------------
 _LOG_DIR = Path(__file__).parent.parent.parent / "logs"
 _LOG_DIR.mkdir(exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.FileHandler(_LOG_DIR / "qbo.log"),
-        logging.StreamHandler(),
-    ],
-)
+_log_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+_log_handlers = [logging.FileHandler(_LOG_DIR / "qbo.log"), logging.StreamHandler()]
+for _h in _log_handlers:
+    _h.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+# Message only: timestamp/level/name are applied by the listener's handlers
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+
+if _queue_handler in logging.getLogger().handlers:  # basicConfig is a no-op if already configured
+    _log_listener = QueueListener(_log_queue, *_log_handlers)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 log = logging.getLogger("qbo.client")
 
 
 class QBOClient:
     """QuickBooks Online API client for financial report retrieval."""
 
-    def __init__(self, auth: Optional[QBOAuth] = None):
+    def __init__(self, auth: Optional[QBOAuth] = None,
+                 closed_through: Optional[str] = None,
+                 use_cache: Optional[bool] = None):
+        """
+        closed_through: last date (YYYY-MM-DD) of the latest closed period;
+            reports ending on or before it are cached for a day. Defaults to
+            QBO_CLOSED_THROUGH; unset means no period is treated as closed.
+        use_cache: False bypasses the response caches entirely. Defaults to
+            on unless EOM_NO_CACHE is set.
+        """
         self.auth = auth or QBOAuth()
+        self.closed_through = closed_through or os.environ.get("QBO_CLOSED_THROUGH") or None
+        if use_cache is None:
+            use_cache = os.environ.get(NO_CACHE_ENV, "") in ("", "0")
+        self.use_cache = use_cache
         self._env = os.environ.get("QBO_ENVIRONMENT", "sandbox").lower()
         self._base = SANDBOX_BASE if self._env == "sandbox" else QBO_BASE
+        self._slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        # Keep-alive pool sized to the concurrency cap, so every call after
+        # the first reuses an open TLS connection
+        self._session = requests.Session()
+        self._session.headers["Accept"] = "application/json"
+        # Large reports (GL) are very compressible JSON; requests inflates
+        # transparently. Pinned explicitly rather than relying on defaults.
+        self._session.headers["Accept-Encoding"] = "gzip, deflate"
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS,
+        ))
+        # key -> (expires_at, body); oldest first for LRU eviction
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # key -> Future of the request currently on the wire (single-flight)
+        self._inflight: dict = {}
+
+    def close(self):
+        """Release pooled HTTP connections."""
+        self._session.close()
+
+    def __del__(self):
+        session = getattr(self, "_session", None)
+        if session is not None:
+            session.close()
 
     def _get(self, path: str, params: Optional[dict] = None) -> dict:
+        """
+        GET a QBO endpoint through the response cache. Identical requests
+        issued concurrently share one network call. If QBO is unreachable
+        (connection error or timeout), an expired cached body is served with
+        a warning; HTTP and auth errors always propagate.
+        """
+        params = params or {}
         url = f"{self._base}/{self.auth.realm_id}/{path}"
-        resp = requests.get(
-            url,
-            headers={
-                "Authorization": f"Bearer {self.auth.access_token}",
-                "Accept": "application/json",
-            },
-            params=params or {},
-            timeout=30,
-        )
+        key = (url, tuple(sorted(params.items())))
+        now = time.monotonic()
+
+        with self._cache_lock:
+            cached = self._cache.get(key) if self.use_cache else None
+            if cached and now < cached[0]:
+                self._cache.move_to_end(key)
+                return cached[1]
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            return pending.result()
+
+        try:
+            body = self._fetch(url, params)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if cached is None:
+                self._settle(key, pending, error=e)
+                raise
+            log.warning("QBO API unavailable, serving stale cached response | url=%s", url)
+            body = cached[1]
+        except BaseException as e:
+            self._settle(key, pending, error=e)
+            raise
+        else:
+            ttl = _cache_ttl(path, params, self.closed_through) if self.use_cache else 0
+            if ttl:
+                with self._cache_lock:
+                    self._cache[key] = (now + ttl, body)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > CACHE_MAXSIZE:
+                        self._cache.popitem(last=False)
+
+        self._settle(key, pending, body=body)
+        return body
+
+    def _settle(self, key, pending: Future, body=None, error=None):
+        """Release waiters on an in-flight request and forget it."""
+        with self._cache_lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            pending.set_exception(error)
+        else:
+            pending.set_result(body)
+
+    def _fetch(self, url: str, params: dict) -> dict:
+        with self._slots:
+            resp = self._session.get(
+                url,
+                headers={"Authorization": f"Bearer {self.auth.access_token}"},
+                params=params,
+                timeout=30,
+            )
 
         # Capture intuit_tid from response headers for Intuit support
         intuit_tid = resp.headers.get("intuit_tid", "n/a")
@@ -66,12 +211,7 @@ class QBOClient:
         if not resp.ok:
             # Parse validation/syntax errors from QBO error body
             try:
-                err_body = resp.json()
-                err_detail = err_body.get("Fault", {}).get("Error", [{}])
-                err_msg = "; ".join(
-                    f"{e.get('code','?')}: {e.get('Message','?')} — {e.get('Detail','')}"
-                    for e in err_detail
-                ) if err_detail else str(err_body)
+                err_msg = _format_qbo_error(_json_loads(resp.content))
             except Exception:
                 err_msg = resp.text[:500]
 
@@ -81,9 +221,10 @@ class QBOClient:
             )
             resp.raise_for_status()
 
-        log.info("QBO API call | status=%s | intuit_tid=%s | url=%s",
-                 resp.status_code, intuit_tid, url)
-        return resp.json()
+        log.info("QBO API call | status=%s | intuit_tid=%s | encoding=%s | url=%s",
+                 resp.status_code, intuit_tid,
+                 resp.headers.get("Content-Encoding", "identity"), url)
+        return _json_loads(resp.content)
 
     # ------------------------------------------------------------------
     # Financial Reports
@@ -100,12 +241,11 @@ class QBOClient:
         Returns:
             DataFrame with columns: account, amount
         """
-        data = self._get("reports/ProfitAndLoss", {
+        return self._report("ProfitAndLoss", {
             "start_date": start_date,
             "end_date": end_date,
             "accounting_method": "Accrual",
         })
-        return self._parse_report(data, "ProfitAndLoss")
 
     def balance_sheet(self, as_of_date: str) -> pd.DataFrame:
         """
@@ -117,34 +257,50 @@ class QBOClient:
         Returns:
             DataFrame with columns: account, amount
         """
-        data = self._get("reports/BalanceSheet", {
+        return self._report("BalanceSheet", {
             "start_date": as_of_date,
             "end_date": as_of_date,
             "accounting_method": "Accrual",
         })
-        return self._parse_report(data, "BalanceSheet")
 
     def cash_flow(self, start_date: str, end_date: str) -> pd.DataFrame:
         """Pull Cash Flow Statement for a date range."""
-        data = self._get("reports/CashFlow", {
+        return self._report("CashFlow", {
             "start_date": start_date,
             "end_date": end_date,
         })
-        return self._parse_report(data, "CashFlow")
 
     def general_ledger(self, start_date: str, end_date: str) -> pd.DataFrame:
         """Pull General Ledger detail for a date range."""
-        data = self._get("reports/GeneralLedger", {
+        return self._report("GeneralLedger", {
             "start_date": start_date,
             "end_date": end_date,
             "accounting_method": "Accrual",
         })
-        return self._parse_report(data, "GeneralLedger")
 
     def accounts_receivable_aging(self) -> pd.DataFrame:
         """Pull AR Aging Summary."""
-        data = self._get("reports/AgedReceivables")
-        return self._parse_report(data, "AgedReceivables")
+        return self._report("AgedReceivables")
+
+    def _report(self, report_type: str, params: Optional[dict] = None) -> pd.DataFrame:
+        """
+        Fetch and flatten one report. Closed-period reports are served
+        from the on-disk parquet cache when a fresh copy exists.
+        """
+        path = f"reports/{report_type}"
+        params = params or {}
+        key = None
+        if self.use_cache and _cache_ttl(path, params, self.closed_through) == CLOSED_PERIOD_TTL:
+            raw = f"{self.auth.realm_id}:{path}:{sorted(params.items())}"
+            key = hashlib.sha256(raw.encode()).hexdigest()
+            df = _disk_cache_get(key)
+            if df is not None:
+                return df
+
+        df = self._parse_report(self._get(path, params), report_type)
+        if key:
+            _disk_cache_put(key, df)
+        return df
 
     # ------------------------------------------------------------------
     # Chart of Accounts
@@ -154,18 +310,18 @@ class QBOClient:
         """Return full Chart of Accounts."""
         data = self._get("query", {"query": "SELECT * FROM Account MAXRESULTS 1000"})
         rows = data.get("QueryResponse", {}).get("Account", [])
-        return pd.DataFrame([
-            {
-                "id": a.get("Id"),
-                "name": a.get("Name"),
-                "fully_qualified_name": a.get("FullyQualifiedName"),
-                "account_type": a.get("AccountType"),
-                "account_sub_type": a.get("AccountSubType"),
-                "active": a.get("Active"),
-                "current_balance": a.get("CurrentBalance", 0.0),
-            }
-            for a in rows
-        ])
+        # Built column by column rather than from one dict per account
+        return pd.DataFrame({
+            "id": [a.get("Id") for a in rows],
+            "name": [a.get("Name") for a in rows],
+            "fully_qualified_name": [a.get("FullyQualifiedName") for a in rows],
+            "account_type": [a.get("AccountType") for a in rows],
+            "account_sub_type": [a.get("AccountSubType") for a in rows],
+            "active": [a.get("Active") for a in rows],
+            "current_balance": np.array(
+                [a.get("CurrentBalance", 0.0) for a in rows], dtype="float64"
+            ),
+        })
 
     # ------------------------------------------------------------------
     # Report parser
@@ -175,34 +331,91 @@ class QBOClient:
     def _parse_report(data: dict, report_type: str) -> pd.DataFrame:
         """
         Flatten QBO report JSON into a DataFrame.
-        QBO reports use a nested Row/Rows/ColData structure.
+        QBO reports use a nested Row/Rows/ColData structure, walked
+        depth-first (parent row, then its children) with an explicit
+        stack of row iterators and collected straight into columns.
+
+        Columns: row_type (category: Section/Data/TotalRow/...), account
+        (string), amount (float64, blanks -> 0), indent (int8 nesting depth).
         """
-        rows_out = []
-        report = data.get("Rows", {})
-
-        def _walk(rows, indent=0):
-            for row in rows.get("Row", []):
-                row_type = row.get("type", "")
-                col_data = row.get("ColData", [])
-                if col_data:
-                    values = [c.get("value", "") for c in col_data]
-                    rows_out.append({
-                        "row_type": row_type,
-                        "account": values[0] if len(values) > 0 else "",
-                        "amount": _to_float(values[1] if len(values) > 1 else ""),
-                        "indent": indent,
-                    })
-                if "Rows" in row:
-                    _walk(row["Rows"], indent + 1)
-
-        _walk(report)
-        df = pd.DataFrame(rows_out)
+        row_types, accounts, amounts, indents = [], [], [], []
+        stack = [iter(data.get("Rows", {}).get("Row", []))]
+        while stack:
+            row = next(stack[-1], None)
+            if row is None:
+                stack.pop()
+                continue
+            col_data = row.get("ColData", [])
+            if col_data:
+                row_types.append(row.get("type", ""))
+                accounts.append(col_data[0].get("value", ""))
+                amounts.append(col_data[1].get("value", "") if len(col_data) > 1 else "")
+                indents.append(len(stack) - 1)
+            if "Rows" in row:
+                stack.append(iter(row["Rows"].get("Row", [])))
+
+        df = pd.DataFrame({
+            "row_type": pd.Categorical(row_types),
+            "account": pd.array(accounts, dtype="string"),
+            "amount": _to_floats(amounts),
+            "indent": pd.array(indents, dtype="int8"),
+        })
         df.attrs["report_type"] = report_type
         return df
 
 
-def _to_float(val: str) -> float:
+def _format_qbo_error(body) -> str:
+    """One-line summary of a QBO Fault body: "code: Message — Detail; ..."."""
+    try:
+        errors = body["Fault"]["Error"]
+    except (KeyError, TypeError):
+        return str(body)[:500]
+    return "; ".join(
+        f"{e.get('code', '?')}: {e.get('Message', '?')} — {e.get('Detail', '')}"
+        for e in errors
+    ) or str(body)[:500]
+
+
+def _disk_cache_get(key: str) -> Optional[pd.DataFrame]:
+    """Cached report for key, or None if absent, stale or unreadable."""
+    cache_file = _CACHE_DIR / f"{key}.parquet"
+    try:
+        if time.time() - cache_file.stat().st_mtime > CLOSED_PERIOD_TTL:
+            return None
+        return pd.read_parquet(cache_file)
+    except Exception:
+        return None
+
+
+def _disk_cache_put(key: str, df: pd.DataFrame):
+    """Best-effort atomic write; failures (e.g. no pyarrow) are ignored."""
+    cache_file = _CACHE_DIR / f"{key}.parquet"
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
     try:
-        return float(str(val).replace(",", "").strip() or 0)
-    except (ValueError, TypeError):
-        return 0.0
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(tmp, compression="zstd", index=False)
+        os.replace(tmp, cache_file)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+
+
+def _cache_ttl(path: str, params: dict, closed_through: Optional[str] = None) -> int:
+    """
+    Seconds a response may be reused; 0 means don't cache it. Only reports
+    ending on or before closed_through get the long closed-period TTL.
+    """
+    today = date.today().isoformat()
+    if today in params.values():
+        return 0
+    if path == "query":
+        return CHART_OF_ACCOUNTS_TTL
+    end_date = params.get("end_date")
+    if closed_through and end_date and end_date <= closed_through:
+        return CLOSED_PERIOD_TTL
+    return CURRENT_PERIOD_TTL
+
+
+def _to_floats(values: list) -> np.ndarray:
+    """Raw report amounts ("1,234.56", "", None) -> float64, unparseable -> 0."""
+    text = pd.Series(values, dtype="string").str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce").fillna(0.0).to_numpy(dtype="float64")
@@ -18,11 +18,14 @@ Then configure in ~/.claude/claude_desktop_config.json:
       }
     }
 """
+import asyncio
 import json
 import sys
 import os
 from datetime import date, timedelta
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Ensure src/ is on the path when run directly
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -30,8 +33,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from dotenv import load_dotenv
 load_dotenv()
 
-from src.qbo.client import QBOClient
-from src.qbo.auth import QBOAuth
+if TYPE_CHECKING:
+    from src.qbo.client import QBOClient
 
 # MCP protocol uses stdio JSON-RPC
 import mcp.server.stdio
@@ -40,131 +43,199 @@ from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 
 server = Server("qbo-set-financial")
-_client: QBOClient | None = None
+_client: "QBOClient | None" = None
 
 
-def get_client() -> QBOClient:
+def get_client() -> "QBOClient":
     global _client
     if _client is None:
+        # Imported on first tool call: the client pulls in pandas, which
+        # would otherwise dominate server cold start
+        from src.qbo.client import QBOClient
         _client = QBOClient()
     return _client
 
 
 def _last_month_range() -> tuple[str, str]:
-    today = date.today()
+    return _last_month_range_for(date.today().isoformat())
+
+
+@lru_cache(maxsize=2)
+def _last_month_range_for(today_iso: str) -> tuple[str, str]:
+    """Memoized per calendar day; keyed on the ISO date so it rolls over."""
+    today = date.fromisoformat(today_iso)
     first_of_month = today.replace(day=1)
     last_month_end = first_of_month - timedelta(days=1)
     last_month_start = last_month_end.replace(day=1)
     return last_month_start.isoformat(), last_month_end.isoformat()
 
 
+# Output format shared by every tool. Markdown reads best for small
+# reports; TSV/JSON are serialized in C and much cheaper for large ones (GL).
+_FORMAT_PARAM = {
+    "type": "string",
+    "enum": ["markdown", "tsv", "json"],
+    "description": "Output format (default: markdown; prefer tsv for large reports)",
+}
+
+
+def _format_df(df, fmt: str = "markdown") -> str:
+    if fmt == "tsv":
+        return df.to_csv(sep="\t", index=False)
+    if fmt == "json":
+        return df.to_json(orient="records")
+    return df.to_markdown(index=False)
+
+
 # ------------------------------------------------------------------
 # MCP Tool definitions
 # ------------------------------------------------------------------
 
-@server.list_tools()
-async def list_tools() -> list[types.Tool]:
-    return [
-        types.Tool(
-            name="qbo_profit_and_loss",
-            description=(
-                "Pull SET Financial's QuickBooks Online Profit & Loss report. "
-                "Returns income and expense accounts with balances for the period."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_date": {"type": "string", "description": "YYYY-MM-DD (default: first of last month)"},
-                    "end_date": {"type": "string", "description": "YYYY-MM-DD (default: last day of last month)"},
-                },
-            },
+# Static tool list, built once at import rather than on every handshake
+_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="qbo_profit_and_loss",
+        description=(
+            "Pull SET Financial's QuickBooks Online Profit & Loss report. "
+            "Returns income and expense accounts with balances for the period."
         ),
-        types.Tool(
-            name="qbo_balance_sheet",
-            description=(
-                "Pull SET Financial's QuickBooks Online Balance Sheet. "
-                "Returns assets, liabilities, and equity as of a given date."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "as_of_date": {"type": "string", "description": "YYYY-MM-DD (default: last day of last month)"},
-                },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_date": {"type": "string", "description": "YYYY-MM-DD (default: first of last month)"},
+                "end_date": {"type": "string", "description": "YYYY-MM-DD (default: last day of last month)"},
+                "format": _FORMAT_PARAM,
             },
+        },
+    ),
+    types.Tool(
+        name="qbo_balance_sheet",
+        description=(
+            "Pull SET Financial's QuickBooks Online Balance Sheet. "
+            "Returns assets, liabilities, and equity as of a given date."
         ),
-        types.Tool(
-            name="qbo_general_ledger",
-            description=(
-                "Pull SET Financial's QuickBooks Online General Ledger detail. "
-                "Use for transaction-level reconciliation against Nortridge data."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_date": {"type": "string", "description": "YYYY-MM-DD"},
-                    "end_date": {"type": "string", "description": "YYYY-MM-DD"},
-                },
-                "required": ["start_date", "end_date"],
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "as_of_date": {"type": "string", "description": "YYYY-MM-DD (default: last day of last month)"},
+                "format": _FORMAT_PARAM,
             },
+        },
+    ),
+    types.Tool(
+        name="qbo_general_ledger",
+        description=(
+            "Pull SET Financial's QuickBooks Online General Ledger detail. "
+            "Use for transaction-level reconciliation against Nortridge data."
         ),
-        types.Tool(
-            name="qbo_chart_of_accounts",
-            description="Return SET Financial's full QuickBooks Chart of Accounts with current balances.",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        types.Tool(
-            name="qbo_cash_flow",
-            description="Pull SET Financial's QuickBooks Online Cash Flow Statement for a date range.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_date": {"type": "string", "description": "YYYY-MM-DD"},
-                    "end_date": {"type": "string", "description": "YYYY-MM-DD"},
-                },
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_date": {"type": "string", "description": "YYYY-MM-DD"},
+                "end_date": {"type": "string", "description": "YYYY-MM-DD"},
+                "format": _FORMAT_PARAM,
+            },
+            "required": ["start_date", "end_date"],
+        },
+    ),
+    types.Tool(
+        name="qbo_chart_of_accounts",
+        description="Return SET Financial's full QuickBooks Chart of Accounts with current balances.",
+        inputSchema={"type": "object", "properties": {"format": _FORMAT_PARAM}},
+    ),
+    types.Tool(
+        name="qbo_cash_flow",
+        description="Pull SET Financial's QuickBooks Online Cash Flow Statement for a date range.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_date": {"type": "string", "description": "YYYY-MM-DD"},
+                "end_date": {"type": "string", "description": "YYYY-MM-DD"},
+                "format": _FORMAT_PARAM,
             },
+        },
+    ),
+    types.Tool(
+        name="qbo_monthly_close",
+        description=(
+            "Pull the full month-end bundle in one call: Profit & Loss, Balance Sheet, "
+            "Cash Flow, General Ledger and Chart of Accounts, fetched concurrently."
         ),
-    ]
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_date": {"type": "string", "description": "YYYY-MM-DD (default: first of last month)"},
+                "end_date": {"type": "string", "description": "YYYY-MM-DD (default: last day of last month)"},
+                "format": _FORMAT_PARAM,
+            },
+        },
+    ),
+]
+
+
+@server.list_tools()
+async def list_tools() -> list[types.Tool]:
+    return list(_TOOLS)  # Shallow copy in case the caller mutates it
+
+
+# Single-report tools: name -> fn(client, arguments, default_start, default_end)
+_DISPATCH = {
+    "qbo_profit_and_loss": lambda c, a, s, e: c.profit_and_loss(
+        start_date=a.get("start_date", s), end_date=a.get("end_date", e)),
+    "qbo_balance_sheet": lambda c, a, s, e: c.balance_sheet(
+        as_of_date=a.get("as_of_date", e)),
+    "qbo_general_ledger": lambda c, a, s, e: c.general_ledger(
+        start_date=a["start_date"], end_date=a["end_date"]),
+    "qbo_chart_of_accounts": lambda c, a, s, e: c.chart_of_accounts(),
+    "qbo_cash_flow": lambda c, a, s, e: c.cash_flow(
+        start_date=a.get("start_date", s), end_date=a.get("end_date", e)),
+}
+
+# Month-end bundle: section title -> single-report tool
+_MONTHLY_CLOSE = {
+    "Profit & Loss": "qbo_profit_and_loss",
+    "Balance Sheet": "qbo_balance_sheet",
+    "Cash Flow": "qbo_cash_flow",
+    "General Ledger": "qbo_general_ledger",
+    "Chart of Accounts": "qbo_chart_of_accounts",
+}
+
+
+async def _monthly_close(client, arguments: dict, fmt: str) -> str:
+    start_default, end_default = _last_month_range()
+    period = {
+        "start_date": arguments.get("start_date", start_default),
+        "end_date": arguments.get("end_date", end_default),
+    }
+    period["as_of_date"] = period["end_date"]
+    # Blocking HTTP calls run in worker threads so the reports are
+    # pulled concurrently: wall time ~ slowest report, not the sum.
+    sections = await asyncio.gather(*(
+        asyncio.to_thread(_DISPATCH[tool], client, period, start_default, end_default)
+        for tool in _MONTHLY_CLOSE.values()
+    ))
+    return "\n\n".join(
+        f"## {title}\n\n{_format_df(df, fmt)}"
+        for title, df in zip(_MONTHLY_CLOSE, sections)
+    )
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     client = get_client()
-    start_default, end_default = _last_month_range()
+    fmt = arguments.get("format", "markdown")
 
     try:
-        if name == "qbo_profit_and_loss":
-            df = client.profit_and_loss(
-                start_date=arguments.get("start_date", start_default),
-                end_date=arguments.get("end_date", end_default),
-            )
-            return [types.TextContent(type="text", text=df.to_markdown(index=False))]
-
-        elif name == "qbo_balance_sheet":
-            df = client.balance_sheet(
-                as_of_date=arguments.get("as_of_date", end_default),
-            )
-            return [types.TextContent(type="text", text=df.to_markdown(index=False))]
-
-        elif name == "qbo_general_ledger":
-            df = client.general_ledger(
-                start_date=arguments["start_date"],
-                end_date=arguments["end_date"],
-            )
-            return [types.TextContent(type="text", text=df.to_markdown(index=False))]
-
-        elif name == "qbo_chart_of_accounts":
-            df = client.chart_of_accounts()
-            return [types.TextContent(type="text", text=df.to_markdown(index=False))]
-
-        elif name == "qbo_cash_flow":
-            df = client.cash_flow(
-                start_date=arguments.get("start_date", start_default),
-                end_date=arguments.get("end_date", end_default),
-            )
-            return [types.TextContent(type="text", text=df.to_markdown(index=False))]
-
-        else:
+        if name == "qbo_monthly_close":
+            text = await _monthly_close(client, arguments, fmt)
+            return [types.TextContent(type="text", text=text)]
+
+        fn = _DISPATCH.get(name)
+        if fn is None:
             return [types.TextContent(type="text", text=f"Unknown tool: {name}")]
+        start_default, end_default = _last_month_range()
+        df = await asyncio.to_thread(fn, client, arguments, start_default, end_default)
+        return [types.TextContent(type="text", text=_format_df(df, fmt))]
 
     except Exception as e:
         return [types.TextContent(type="text", text=f"Error calling {name}: {e}")]
@@ -191,5 +262,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -2,10 +2,17 @@
 Reconciliation engine for SET Financial Corporation EOM Close.
 Validates source data against QBO balances and performs roll-forward checks.
 """
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 from dataclasses import dataclass, field
 from typing import Optional
 
+# Thresholds, built once (string -> Decimal parsing is not free)
+_PENNY = Decimal("0.01")            # PASS band for recon items; exact-match tolerance
+_ONE_DOLLAR = Decimal("1.00")       # PASS band for roll-forwards / component checks
+_TOL_DEFAULT = Decimal("100")       # Default recon item tolerance
+_TOL_UNEARNED = Decimal("50")       # Unearned interest register vs QBO
+_ROLL_WARN = Decimal("100.00")      # Roll-forward WARNING band
+
 
 @dataclass
 class ReconItem:
@@ -14,14 +21,14 @@ class ReconItem:
     source_value: Decimal
     target_value: Decimal
     difference: Decimal = Decimal("0")
-    tolerance: Decimal = Decimal("100")
+    tolerance: Decimal = _TOL_DEFAULT
     status: str = ""  # PASS, FAIL, WARNING
     notes: str = ""
 
     def __post_init__(self):
         self.difference = self.source_value - self.target_value
         abs_diff = abs(self.difference)
-        if abs_diff <= Decimal("0.01"):
+        if abs_diff <= _PENNY:
             self.status = "PASS"
         elif abs_diff <= self.tolerance:
             self.status = "WARNING"
@@ -38,25 +45,40 @@ class ReconciliationReport:
     items: list = field(default_factory=list)
     roll_forwards: list = field(default_factory=list)
     validation_checks: list = field(default_factory=list)
+    # Status tallies, kept current by add_item/add_check
+    _counts: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.recount()
 
     @property
     def pass_count(self) -> int:
-        return sum(1 for i in self.items if i.status == "PASS")
+        return self._counts["PASS"]
 
     @property
     def fail_count(self) -> int:
-        return sum(1 for i in self.items if i.status == "FAIL")
+        return self._counts["FAIL"]
 
     @property
     def warning_count(self) -> int:
-        return sum(1 for i in self.items if i.status == "WARNING")
+        return self._counts["WARNING"]
+
+    def recount(self):
+        """Rebuild the tallies; call after mutating `items` directly."""
+        self._counts = {"PASS": 0, "FAIL": 0, "WARNING": 0}
+        for item in self.items:
+            self._counts[item.status] += 1
+
+    def add_item(self, item: ReconItem) -> ReconItem:
+        self.items.append(item)
+        self._counts[item.status] += 1
+        return item
 
     def add_check(self, name: str, source: Decimal, target: Decimal,
-                  tolerance: Decimal = Decimal("100")) -> ReconItem:
+                  tolerance: Decimal = _TOL_DEFAULT) -> ReconItem:
         item = ReconItem(name=name, source_value=source, target_value=target,
                         tolerance=tolerance)
-        self.items.append(item)
-        return item
+        return self.add_item(item)
 
     def add_validation(self, name: str, passed: bool, detail: str = ""):
         self.validation_checks.append({
@@ -66,7 +88,13 @@ class ReconciliationReport:
 
 @dataclass
 class RollForward:
-    """Roll-forward reconciliation (beginning + adds - subtracts = ending)."""
+    """
+    Roll-forward reconciliation (beginning + adds - subtracts = ending).
+    Totals are always derived from the additions / subtractions dicts, so
+    movements can be recorded by assigning into them directly. They are
+    summed as Decimal, not integer cents, so sub-cent inputs are not rounded
+    before the PASS/WARNING/FAIL bands are applied.
+    """
     name: str
     beginning_balance: Decimal = Decimal("0")
     additions: dict = field(default_factory=dict)
@@ -86,9 +114,10 @@ class RollForward:
 
     @property
     def status(self) -> str:
-        if abs(self.difference) <= Decimal("1.00"):
+        abs_diff = abs(self.difference)
+        if abs_diff <= _ONE_DOLLAR:
             return "PASS"
-        elif abs(self.difference) <= Decimal("100.00"):
+        elif abs_diff <= _ROLL_WARN:
             return "WARNING"
         return "FAIL"
 
@@ -110,7 +139,7 @@ def build_loans_receivable_recon(
         name="Loans Receivable: Nortridge vs QBO",
         source_value=nortridge_current_balance,
         target_value=qbo_net,
-        tolerance=Decimal("100"),
+        tolerance=_TOL_DEFAULT,
     )
 
 
@@ -126,7 +155,7 @@ def build_unearned_interest_recon(
         name="Unearned Interest: Register vs QBO",
         source_value=register_unearned,
         target_value=abs(qbo_unearned),
-        tolerance=Decimal("50"),
+        tolerance=_TOL_UNEARNED,
     )
 
 
@@ -139,7 +168,7 @@ def build_pier_balance_recon(
         name="Pier Facility Balance: Statement vs QBO",
         source_value=statement_balance,
         target_value=qbo_pier_loc,
-        tolerance=Decimal("0.01"),  # Exact match required
+        tolerance=_PENNY,  # Exact match required
     )
 
 
@@ -157,7 +186,7 @@ def build_charge_off_validation(
         "expected_total": calculated,
         "actual_total": total_chargeoff,
         "difference": calculated - total_chargeoff,
-        "status": "PASS" if abs(calculated - total_chargeoff) < Decimal("1.00") else "FAIL",
+        "status": "PASS" if abs(calculated - total_chargeoff) < _ONE_DOLLAR else "FAIL",
     }
 
 
@@ -179,7 +208,6 @@ def build_collections_validation(
                     - AmountToRefund + InsuranceRebate
     CashReceived = TotalCollected - BalanceRenewed - InterestRebate
     """
-    total_collected_calc = principal + interest + late_fees + nsf_fees + recoveries - refunds + insurance_rebate
     return {
         "name": "Collections Balance Check",
         "principal": principal,
@@ -1,8 +1,13 @@
 """
 CSV report generator for QBO journal entry import.
 """
+import csv
+import io
+import logging
 from pathlib import Path
 
+log = logging.getLogger("eom_close.reports")
+
 
 def generate_csv_output(journal_entries, output_dir, period):
     """Generate a flat CSV for QBO journal entry import."""
@@ -15,13 +20,26 @@ def generate_csv_output(journal_entries, output_dir, period):
         csv_filename = f"qbo_journal_entries_{period.replace(' ', '_').lower()}.csv"
 
     csv_path = Path(output_dir) / csv_filename
-    with open(csv_path, 'w') as f:
-        f.write("JE_Number,Date,Account_Number,Account_Name,Class,Debit,Credit,Memo\n")
-        for je in journal_entries:
-            for line in je.lines:
-                debit_str = f"{line.debit}" if line.debit > 0 else ""
-                credit_str = f"{line.credit}" if line.credit > 0 else ""
-                memo = line.memo.replace(",", ";").replace('"', "'")
-                f.write(f'{je.je_number},{je.je_date},{line.account_code},"{line.account_name}",{line.class_name},{debit_str},{credit_str},"{memo}"\n')
-    print(f"  ✓ QBO import CSV saved: {csv_path}")
+    # csv.writer quotes and escapes fields itself (in C), so memos keep their
+    # commas and quotes. The file is a few hundred lines, so it is built in
+    # memory and written with a single write() call.
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(("JE_Number", "Date", "Account_Number", "Account_Name",
+                     "Class", "Debit", "Credit", "Memo"))
+    # One writerows() call drains every line in C; the JE number and ISO
+    # date are still resolved once per JE by the inner generator.
+    writer.writerows(
+        (je_number, je_date, line.account_code, line.account_name,
+         line.class_name, line.debit if line.debit > 0 else "",
+         line.credit if line.credit > 0 else "", line.memo)
+        for je_number, je_date, lines in (
+            (je.je_number, je.je_date.isoformat(), je.lines) for je in journal_entries
+        )
+        for line in lines
+    )
+    # Fixed UTF-8 rather than the locale encoding (cp1252 on Windows cannot
+    # hold every memo character)
+    csv_path.write_text(buf.getvalue(), encoding="utf-8")
+    log.info("  ✓ QBO import CSV saved: %s", csv_path)
     return csv_path
@@ -1,448 +1,547 @@
 """
 Excel close package generator for SET Financial Corporation EOM Close.
 Extracted from run_close.py to keep the orchestrator focused on business logic.
+
+The package layout is built once as backend-neutral sheets (rows of
+(value, style name) cells plus merges and column widths) and rendered by
+either openpyxl or xlsxwriter.
 """
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from importlib.util import find_spec
 from pathlib import Path
 
+log = logging.getLogger("eom_close.reports")
+
+WRITERS = ("openpyxl", "xlsxwriter")
+# xlsxwriter streams rows and is the faster writer; openpyxl is the fallback
+# when it is not installed. Checked without importing it.
+DEFAULT_WRITER = "xlsxwriter" if find_spec("xlsxwriter") else "openpyxl"
+
+MONEY_FORMAT = '#,##0.00'
+DATE_FORMAT = 'mm/dd/yyyy'
+
+# Named cell styles shared by both writers: font (bold/italic/size/color),
+# solid fill colour, thin box border and number format.
+STYLES = {
+    "title": {"bold": True, "size": 14},
+    "subtitle": {"italic": True, "size": 10},
+    "note": {"italic": True, "size": 9},
+    "bold": {"bold": True},
+    "je_number": {"bold": True, "size": 11},
+    "header": {"bold": True, "size": 12, "color": "FFFFFF", "fill": "1F4E79"},
+    "header_band": {"fill": "1F4E79"},
+    "subheader": {"bold": True, "size": 10, "fill": "D6E4F0", "border": True},
+    "bordered": {"border": True},
+    "money": {"border": True, "number_format": MONEY_FORMAT},
+    "date": {"border": True, "number_format": DATE_FORMAT},
+    "total": {"bold": True, "border": True},
+    "total_money": {"bold": True, "border": True, "number_format": MONEY_FORMAT},
+    "pass": {"fill": "C6EFCE", "border": True},
+    "fail": {"fill": "FFC7CE", "border": True},
+    "warn": {"fill": "FFEB9C", "border": True},
+    "review": {"bold": True, "fill": "FFFF00"},
+}
+
+
+# Source Data Summary blocks: (label, summary attribute). Counts come first
+# and stay ints; Decimal amounts become money-formatted floats.
+_COLL_FIELDS = (
+    ("Transactions", "transaction_count"),
+    ("Total Collected", "total_collected"),
+    ("Principal", "principal"),
+    ("Interest Collected", "interest_collected"),
+    ("Interest Rebate", "interest_rebate"),
+    ("Late Fees", "late_fees"),
+    ("NSF Fees", "nsf_fees"),
+    ("Insurance Rebate", "insurance_rebate"),
+    ("Balance Renewed", "balance_renewed"),
+    ("Recovery", "recovery"),
+    ("Amount to Refund", "amount_to_refund"),
+    ("Cash Received", "cash_received"),
+)
+
+_LOAN_FIELDS = (
+    ("Loans Originated", "loan_count"),
+    ("Note Amount", "note_amount"),
+    ("Finance Charge", "finance_charge"),
+    ("Cash to Borrower", "cash_to_borrower"),
+    ("Credit Life Premium", "credit_life_premium"),
+    ("A&H Premium", "ah_premium"),
+    ("Balance Renewed", "balance_renewed"),
+)
+
+_CO_FIELDS = (
+    ("Accounts", "account_count"),
+    ("Note Amount", "note_amount"),
+    ("Net Charge Off (P&L)", "charge_off_amount"),
+    ("Unearned Reversed", "pc_interest_rebate"),
+    ("Total Charge Off (Gross)", "total_charge_off_amt"),
+)
+
+_UE_FIELDS = (
+    ("Active Loans", "loan_count"),
+    ("Current Balance (Portfolio)", "total_current_balance"),
+    ("Unearned Interest (New)", "unearned_new_interest"),
+    ("Unearned Interest (Existing)", "unearned_existing_interest"),
+    ("Total Unearned Interest", "total_unearned_interest"),
+    ("Unearned Finance Fees", "total_unearned_finance_fees"),
+    ("Unearned Credit Life", "unearned_credit_life"),
+    ("Unearned Disability (A&H)", "unearned_disability"),
+    ("Unearned IUI", "unearned_iui"),
+    ("Unearned Property", "unearned_property"),
+    ("Unearned VSI (Auto)", "unearned_vsi"),
+    ("Total Unearned Insurance", "total_unearned_insurance"),
+    ("Interest Collected This Month", "interest_collected_month"),
+)
+
+
+@dataclass
+class _Sheet:
+    """One worksheet's layout: rows of cells (None or (value, style))."""
+    title: str
+    widths: dict                                  # column letter -> width
+    rows: list = field(default_factory=list)
+    merges: list = field(default_factory=list)    # "B5:G5" style ranges
+
+
+def _c(value=None, style=None) -> tuple:
+    """A cell: value plus optional STYLES name."""
+    return (value, style)
+
+
+# Cells are immutable tuples, so the empty styled cells repeated across
+# rows (zero side of every JE line, header band fill) are shared objects
+_BORDERED_BLANK = _c(style="bordered")
+_HEADER_BAND = _c(style="header_band")
+
+
+def _summary_items(view, fields) -> list:
+    """(label, value) items for _section() from a _FloatView and a field table."""
+    return [(label, getattr(view, attr)) for label, attr in fields]
+
+
+def _section(title, items) -> list:
+    """Header band plus one bordered row per (label, value[, note]) item;
+    float values get the money format."""
+    width = len(items[0])
+    rows = [[_c(title, style="header")] + [_HEADER_BAND] * (width - 1)]
+    for label, value, *rest in items:
+        rows.append([_c(label, style="bordered"),
+                     _c(value, style="money" if isinstance(value, float) else "bordered")]
+                    + [_c(v, style="bordered") for v in rest])
+    return rows
+
+
+class _FloatView:
+    """Read-only view of a summary whose Decimal attributes come back as
+    floats, each converted once however many sheets show it. Every amount
+    on the summary dataclasses is a Decimal, so that one float() per value
+    is never redundant; other attributes (counts) pass through as-is."""
+    __slots__ = ("_obj", "_cache")
+
+    def __init__(self, obj):
+        self._obj = obj
+        self._cache = {}
+
+    def __getattr__(self, name):
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = getattr(self._obj, name)
+            if isinstance(value, Decimal):
+                value = float(value)
+            self._cache[name] = value
+            return value
+
+
+def _line_amounts(journal_entries) -> list:
+    """
+    Per-JE lists of (debit, credit) floats. Every line of every JE goes into
+    one contiguous (n, 2) float64 array, cast from Decimal in a single numpy
+    pass, then sliced back out by each JE's line offsets. Text columns stay
+    on the line objects; fixed-width numpy strings would truncate memos.
+    """
+    import numpy as np
+
+    pairs = np.array([(line.debit, line.credit)
+                      for je in journal_entries for line in je.lines],
+                     dtype=object).reshape(-1, 2)
+    flat = pairs.astype(np.float64).tolist()
+    bounds = np.cumsum([0] + [len(je.lines) for je in journal_entries]).tolist()
+    return [flat[start:end] for start, end in zip(bounds, bounds[1:])]
+
 
 def generate_excel_output(journal_entries, recon, coll_summary, loan_summary,
                           co_summary, ue_summary, pier_data, dpv_data, metacorp,
-                          output_dir, period):
-    """Generate the Excel close package."""
-    import openpyxl
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, numbers
-    from openpyxl.utils import get_column_letter
-
-    wb = openpyxl.Workbook()
-
-    # Styles
-    header_font = Font(bold=True, size=12, color="FFFFFF")
-    header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-    subheader_font = Font(bold=True, size=10)
-    subheader_fill = PatternFill(start_color="D6E4F0", end_color="D6E4F0", fill_type="solid")
-    money_format = '#,##0.00'
-    pass_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    fail_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    warn_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin'),
-    )
-    review_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+                          output_dir, period, writer: str = DEFAULT_WRITER,
+                          qbo_sheet: bool = True):
+    """
+    Generate the Excel close package with the given writer backend.
+    qbo_sheet=False leaves out the QBO Import sheet, which repeats the QBO
+    import CSV line for line, for runs where only the CSV is imported.
+    """
+    if writer not in WRITERS:
+        raise ValueError(f"Unknown Excel writer {writer!r}; expected one of {WRITERS}")
+
+    sheets = _build_sheets(journal_entries, recon, coll_summary, loan_summary,
+                           co_summary, ue_summary, pier_data, dpv_data, metacorp, period,
+                           qbo_sheet)
+
+    # Build dynamic filename from period
+    period_parts = period.split()
+    if len(period_parts) == 2:
+        month_name, year = period_parts
+        output_filename = f"SET_Financial_EOM_Close_{month_name}{year}.xlsx"
+    else:
+        output_filename = f"SET_Financial_EOM_Close_{period.replace(' ', '_')}.xlsx"
+
+    output_path = Path(output_dir) / output_filename
+    # Sheets are rendered serially on purpose. Serialising them in worker
+    # processes would mean shipping the row lists to each worker and
+    # hand-assembling the zip (workbook.xml, styles.xml, shared style ids),
+    # and a close package is a few thousand cells: process start-up alone
+    # costs more than writing every sheet.
+    if writer == "xlsxwriter":
+        _write_xlsxwriter(sheets, output_path)
+    else:
+        _write_openpyxl(sheets, output_path)
+    log.info("  ✓ Close package saved: %s", output_path)
+
+    return output_path
+
+
+def _build_sheets(journal_entries, recon, coll_summary, loan_summary,
+                  co_summary, ue_summary, pier_data, dpv_data, metacorp, period,
+                  qbo_sheet: bool = True) -> list:
+    """Lay out the five package sheets, top to bottom."""
+    sheets = []
+    # Several totals appear on both the Executive and Source Data sheets
+    coll, loan, co, ue = (_FloatView(s) for s in (coll_summary, loan_summary, co_summary, ue_summary))
+    pier, dpv, meta = _FloatView(pier_data), _FloatView(dpv_data), _FloatView(metacorp)
+    # Both the JE and QBO Import sheets list every line; convert once
+    amounts = _line_amounts(journal_entries)
 
     # ── Sheet 1: Executive Summary ──
-    ws = wb.active
-    ws.title = "Executive Summary"
-    ws.column_dimensions['A'].width = 35
-    ws.column_dimensions['B'].width = 20
-    ws.column_dimensions['C'].width = 20
-    ws.column_dimensions['D'].width = 25
-
-    row = 1
-    ws.merge_cells('A1:D1')
-    ws['A1'] = f"SET Financial Corporation — EOM Close Package: {period}"
-    ws['A1'].font = Font(bold=True, size=14)
-    row = 3
-
-    # Key Metrics
-    ws[f'A{row}'] = "KEY METRICS"
-    ws[f'A{row}'].font = header_font
-    ws[f'A{row}'].fill = header_fill
-    ws[f'B{row}'].fill = header_fill
-    ws[f'C{row}'].fill = header_fill
-    row += 1
+    summary = _Sheet("Executive Summary", {"A": 35, "B": 20, "C": 20, "D": 25})
+    sheets.append(summary)
+    rows, merges = summary.rows, summary.merges
 
+    merges.append('A1:D1')
     metrics = [
-        ("Loans Originated", float(loan_summary.note_amount), f"{loan_summary.loan_count} loans"),
-        ("Cash Disbursed", float(loan_summary.cash_to_borrower), "Net to borrowers"),
-        ("Collections Received", float(coll_summary.cash_received), f"{coll_summary.transaction_count} payments"),
-        ("Principal Collected", float(coll_summary.principal), ""),
-        ("Interest Collected", float(coll_summary.interest_collected), "Via unearned"),
+        ("Loans Originated", loan.note_amount, f"{loan_summary.loan_count} loans"),
+        ("Cash Disbursed", loan.cash_to_borrower, "Net to borrowers"),
+        ("Collections Received", coll.cash_received, f"{coll_summary.transaction_count} payments"),
+        ("Principal Collected", coll.principal, ""),
+        ("Interest Collected", coll.interest_collected, "Via unearned"),
         ("Late/NSF Fees", float(coll_summary.late_fees + coll_summary.nsf_fees), ""),
-        ("Gross Charge-Offs", float(co_summary.total_charge_off_amt), f"{co_summary.account_count} accounts"),
-        ("Net Charge-Offs (P&L)", float(co_summary.charge_off_amount), "Bad debt expense"),
-        ("Unearned Reversed on COs", float(co_summary.pc_interest_rebate), ""),
-        ("Bad Debt Sale (Metacorp)", float(metacorp.transfer_amount), f"{metacorp.num_accounts} accounts"),
-        ("Pier Interest", float(pier_data.accrued_interest_due), f"Balance: ${pier_data.ending_balance}"),
-        ("DPV Interest", float(dpv_data.total_due), f"Balance: ${dpv_data.principal_balance}"),
-        ("Recoveries", float(coll_summary.recovery), "Charged-off account collections"),
-        ("Refunds", float(coll_summary.amount_to_refund), "Customer refunds"),
+        ("Gross Charge-Offs", co.total_charge_off_amt, f"{co_summary.account_count} accounts"),
+        ("Net Charge-Offs (P&L)", co.charge_off_amount, "Bad debt expense"),
+        ("Unearned Reversed on COs", co.pc_interest_rebate, ""),
+        ("Bad Debt Sale (Metacorp)", meta.transfer_amount, f"{metacorp.num_accounts} accounts"),
+        ("Pier Interest", pier.accrued_interest_due, f"Balance: ${pier_data.ending_balance}"),
+        ("DPV Interest", dpv.total_due, f"Balance: ${dpv_data.principal_balance}"),
+        ("Recoveries", coll.recovery, "Charged-off account collections"),
+        ("Refunds", coll.amount_to_refund, "Customer refunds"),
     ]
 
-    for label, amount, note in metrics:
-        ws[f'A{row}'] = label
-        ws[f'B{row}'] = amount
-        ws[f'B{row}'].number_format = money_format
-        ws[f'C{row}'] = note
-        for col in ['A', 'B', 'C']:
-            ws[f'{col}{row}'].border = thin_border
-        row += 1
-
-    row += 1
-    # Portfolio snapshot
-    ws[f'A{row}'] = "PORTFOLIO SNAPSHOT"
-    ws[f'A{row}'].font = header_font
-    ws[f'A{row}'].fill = header_fill
-    ws[f'B{row}'].fill = header_fill
-    ws[f'C{row}'].fill = header_fill
-    row += 1
-
     portfolio_metrics = [
         ("Active Loans (Unearned Register)", ue_summary.loan_count, ""),
-        ("Total Current Balance", float(ue_summary.total_current_balance), "Nortridge"),
-        ("Total Unearned Interest", float(ue_summary.total_unearned_interest), "QBO 110010"),
-        ("Total Unearned Insurance", float(ue_summary.total_unearned_insurance), "QBO 110050-110090"),
-        ("Pier Facility Balance", float(pier_data.ending_balance), "QBO 291300"),
-        ("DPV LOC Balance", float(dpv_data.principal_balance), "QBO 31100"),
+        ("Total Current Balance", ue.total_current_balance, "Nortridge"),
+        ("Total Unearned Interest", ue.total_unearned_interest, "QBO 110010"),
+        ("Total Unearned Insurance", ue.total_unearned_insurance, "QBO 110050-110090"),
+        ("Pier Facility Balance", pier.ending_balance, "QBO 291300"),
+        ("DPV LOC Balance", dpv.principal_balance, "QBO 31100"),
+    ]
+    rows += [
+        [_c(f"SET Financial Corporation — EOM Close Package: {period}", style="title")],
+        [],
+        *_section("KEY METRICS", metrics),
+        [],
+        *_section("PORTFOLIO SNAPSHOT", portfolio_metrics),
     ]
-    for label, value, note in portfolio_metrics:
-        ws[f'A{row}'] = label
-        if isinstance(value, (int,)):
-            ws[f'B{row}'] = value
-        else:
-            ws[f'B{row}'] = value
-            ws[f'B{row}'].number_format = money_format
-        ws[f'C{row}'] = note
-        for col in ['A', 'B', 'C']:
-            ws[f'{col}{row}'].border = thin_border
-        row += 1
 
     # ── Sheet 2: Journal Entries ──
-    ws_je = wb.create_sheet("Journal Entries")
-    ws_je.column_dimensions['A'].width = 10
-    ws_je.column_dimensions['B'].width = 12
-    ws_je.column_dimensions['C'].width = 35
-    ws_je.column_dimensions['D'].width = 10
-    ws_je.column_dimensions['E'].width = 15
-    ws_je.column_dimensions['F'].width = 15
-    ws_je.column_dimensions['G'].width = 45
-    ws_je.column_dimensions['H'].width = 15
-
-    row = 1
-    ws_je.merge_cells('A1:G1')
-    ws_je['A1'] = f"Journal Entries — {period}"
-    ws_je['A1'].font = Font(bold=True, size=14)
-    row = 3
-
-    for je in journal_entries:
+    je_sheet = _Sheet("Journal Entries", {"A": 10, "B": 12, "C": 35, "D": 10,
+                                          "E": 15, "F": 15, "G": 45, "H": 15})
+    sheets.append(je_sheet)
+    rows, merges = je_sheet.rows, je_sheet.merges
+
+    merges.append('A1:G1')
+    rows += [[_c(f"Journal Entries — {period}", style="title")], []]
+
+    for je, je_amounts in zip(journal_entries, amounts):
         # JE Header
-        ws_je[f'A{row}'] = je.je_number
-        ws_je[f'A{row}'].font = Font(bold=True, size=11)
-        ws_je[f'B{row}'] = je.description
-        ws_je[f'B{row}'].font = Font(bold=True)
-        ws_je.merge_cells(f'B{row}:G{row}')
+        header = [_c(je.je_number, style="je_number"),
+                  _c(je.description, style="bold")]
+        merges.append(f'B{len(rows) + 1}:G{len(rows) + 1}')
         if je.review_required:
-            ws_je[f'H{row}'] = "⚠ REVIEW"
-            ws_je[f'H{row}'].fill = review_fill
-            ws_je[f'H{row}'].font = Font(bold=True)
-        row += 1
+            header += [None] * 5 + [_c("⚠ REVIEW", style="review")]
+        rows.append(header)
 
-        ws_je[f'A{row}'] = f"Date: {je.je_date}"
-        ws_je[f'B{row}'] = f"Source: {je.source_file}"
-        row += 1
+        rows.append([_c(f"Date: {je.je_date}"), _c(f"Source: {je.source_file}")])
 
         # Column headers
-        for col_idx, header in enumerate(["", "Account", "Account Name", "Class", "Debit", "Credit", "Memo"], 1):
-            cell = ws_je.cell(row=row, column=col_idx, value=header)
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-            cell.border = thin_border
-        row += 1
+        rows.append([
+            _c(h, style="subheader")
+            for h in ["", "Account", "Account Name", "Class", "Debit", "Credit", "Memo"]
+        ])
 
         # Lines
-        for line in je.lines:
-            ws_je[f'B{row}'] = line.account_code
-            ws_je[f'C{row}'] = line.account_name
-            ws_je[f'D{row}'] = line.class_name
-            if line.debit > 0:
-                ws_je[f'E{row}'] = float(line.debit)
-                ws_je[f'E{row}'].number_format = money_format
-            if line.credit > 0:
-                ws_je[f'F{row}'] = float(line.credit)
-                ws_je[f'F{row}'].number_format = money_format
-            ws_je[f'G{row}'] = line.memo
-            for col in ['B', 'C', 'D', 'E', 'F', 'G']:
-                ws_je[f'{col}{row}'].border = thin_border
-            row += 1
+        for line, (debit, credit) in zip(je.lines, je_amounts):
+            rows.append([
+                None,
+                _c(line.account_code, style="bordered"),
+                _c(line.account_name, style="bordered"),
+                _c(line.class_name, style="bordered"),
+                _c(debit, style="money") if debit > 0 else _BORDERED_BLANK,
+                _c(credit, style="money") if credit > 0 else _BORDERED_BLANK,
+                _c(line.memo, style="bordered"),
+            ])
 
         # Totals
-        ws_je[f'C{row}'] = "TOTALS"
-        ws_je[f'C{row}'].font = Font(bold=True)
-        ws_je[f'E{row}'] = float(je.total_debits)
-        ws_je[f'E{row}'].number_format = money_format
-        ws_je[f'E{row}'].font = Font(bold=True)
-        ws_je[f'F{row}'] = float(je.total_credits)
-        ws_je[f'F{row}'].number_format = money_format
-        ws_je[f'F{row}'].font = Font(bold=True)
-        balanced = je.is_balanced
-        ws_je[f'G{row}'] = "✓ Balanced" if balanced else f"✗ Diff: ${je.total_debits - je.total_credits}"
-        ws_je[f'G{row}'].fill = pass_fill if balanced else fail_fill
-        for col in ['C', 'E', 'F', 'G']:
-            ws_je[f'{col}{row}'].border = thin_border
-        row += 1
+        total_dr, total_cr, balanced = je.total_debits, je.total_credits, je.is_balanced
+        rows.append([
+            None, None,
+            _c("TOTALS", style="total"),
+            None,
+            _c(float(total_dr), style="total_money"),
+            _c(float(total_cr), style="total_money"),
+            _c("✓ Balanced" if balanced else f"✗ Diff: ${total_dr - total_cr}",
+                 style="pass" if balanced else "fail"),
+        ])
 
         # Notes
         if je.notes:
-            ws_je[f'B{row}'] = f"Notes: {je.notes}"
-            ws_je[f'B{row}'].font = Font(italic=True, size=9)
-            ws_je.merge_cells(f'B{row}:G{row}')
-            row += 1
+            merges.append(f'B{len(rows) + 1}:G{len(rows) + 1}')
+            rows.append([None, _c(f"Notes: {je.notes}", style="note")])
 
-        row += 1  # Blank row between JEs
+        rows.append([])  # Blank row between JEs
 
     # ── Sheet 3: Reconciliation ──
-    ws_recon = wb.create_sheet("Reconciliation")
-    ws_recon.column_dimensions['A'].width = 40
-    ws_recon.column_dimensions['B'].width = 18
-    ws_recon.column_dimensions['C'].width = 18
-    ws_recon.column_dimensions['D'].width = 15
-    ws_recon.column_dimensions['E'].width = 12
-    ws_recon.column_dimensions['F'].width = 30
-
-    row = 1
-    ws_recon.merge_cells('A1:F1')
-    ws_recon['A1'] = f"Reconciliation Report — {period}"
-    ws_recon['A1'].font = Font(bold=True, size=14)
-    row = 3
-
-    # Balance Reconciliations
-    ws_recon[f'A{row}'] = "BALANCE RECONCILIATIONS"
-    ws_recon[f'A{row}'].font = header_font
-    ws_recon[f'A{row}'].fill = header_fill
-    for col in ['B', 'C', 'D', 'E', 'F']:
-        ws_recon[f'{col}{row}'].fill = header_fill
-    row += 1
-
-    headers = ["Check", "Source Value", "QBO Value", "Difference", "Status", "Notes"]
-    for col_idx, h in enumerate(headers, 1):
-        cell = ws_recon.cell(row=row, column=col_idx, value=h)
-        cell.font = subheader_font
-        cell.fill = subheader_fill
-        cell.border = thin_border
-    row += 1
+    recon_sheet = _Sheet("Reconciliation", {"A": 40, "B": 18, "C": 18, "D": 15, "E": 12, "F": 30})
+    sheets.append(recon_sheet)
+    rows, merges = recon_sheet.rows, recon_sheet.merges
+
+    merges.append('A1:F1')
+    rows += [
+        [_c(f"Reconciliation Report — {period}", style="title")],
+        [],
+        # Balance Reconciliations
+        [_c("BALANCE RECONCILIATIONS", style="header")]
+        + [_HEADER_BAND] * 5,
+        [_c(h, style="subheader")
+         for h in ["Check", "Source Value", "QBO Value", "Difference", "Status", "Notes"]],
+    ]
 
     for item in recon.items:
-        ws_recon[f'A{row}'] = item.name
-        ws_recon[f'B{row}'] = float(item.source_value)
-        ws_recon[f'B{row}'].number_format = money_format
-        ws_recon[f'C{row}'] = float(item.target_value)
-        ws_recon[f'C{row}'].number_format = money_format
-        ws_recon[f'D{row}'] = float(item.difference)
-        ws_recon[f'D{row}'].number_format = money_format
-        ws_recon[f'E{row}'] = item.status
-        status_fill = pass_fill if item.status == "PASS" else (warn_fill if item.status == "WARNING" else fail_fill)
-        ws_recon[f'E{row}'].fill = status_fill
-        ws_recon[f'F{row}'] = item.notes
-        for col in ['A', 'B', 'C', 'D', 'E', 'F']:
-            ws_recon[f'{col}{row}'].border = thin_border
-        row += 1
-
-    row += 2
+        status_style = "pass" if item.status == "PASS" else ("warn" if item.status == "WARNING" else "fail")
+        rows.append([
+            _c(item.name, style="bordered"),
+            _c(float(item.source_value), style="money"),
+            _c(float(item.target_value), style="money"),
+            _c(float(item.difference), style="money"),
+            _c(item.status, style=status_style),
+            _c(item.notes, style="bordered"),
+        ])
+
+    rows += [[], []]
 
     # Validation Checks
-    ws_recon[f'A{row}'] = "VALIDATION CHECKS"
-    ws_recon[f'A{row}'].font = header_font
-    ws_recon[f'A{row}'].fill = header_fill
-    for col in ['B', 'C']:
-        ws_recon[f'{col}{row}'].fill = header_fill
-    row += 1
-
-    for col_idx, h in enumerate(["Check", "Status", "Detail"], 1):
-        cell = ws_recon.cell(row=row, column=col_idx, value=h)
-        cell.font = subheader_font
-        cell.fill = subheader_fill
-        cell.border = thin_border
-    row += 1
+    rows.append([_c("VALIDATION CHECKS", style="header"),
+                 _HEADER_BAND, _HEADER_BAND])
+    rows.append([_c(h, style="subheader")
+                 for h in ["Check", "Status", "Detail"]])
 
     for check in recon.validation_checks:
-        ws_recon[f'A{row}'] = check["name"]
-        ws_recon[f'B{row}'] = check["status"]
-        status_fill = pass_fill if check["status"] == "PASS" else fail_fill
-        ws_recon[f'B{row}'].fill = status_fill
-        ws_recon[f'C{row}'] = check.get("detail", "")
-        for col in ['A', 'B', 'C']:
-            ws_recon[f'{col}{row}'].border = thin_border
-        row += 1
+        status_style = "pass" if check["status"] == "PASS" else "fail"
+        rows.append([
+            _c(check["name"], style="bordered"),
+            _c(check["status"], style=status_style),
+            _c(check.get("detail", ""), style="bordered"),
+        ])
 
     # ── Sheet 4: Source Data Summary ──
-    ws_data = wb.create_sheet("Source Data Summary")
-    ws_data.column_dimensions['A'].width = 35
-    ws_data.column_dimensions['B'].width = 18
-    ws_data.column_dimensions['C'].width = 18
-
-    row = 1
-    ws_data['A1'] = f"Source Data Summary — {period}"
-    ws_data['A1'].font = Font(bold=True, size=14)
-    row = 3
-
-    # Collection Register summary
-    ws_data[f'A{row}'] = "COLLECTION REGISTER"
-    ws_data[f'A{row}'].font = header_font
-    ws_data[f'A{row}'].fill = header_fill
-    ws_data[f'B{row}'].fill = header_fill
-    row += 1
-    coll_items = [
-        ("Transactions", coll_summary.transaction_count),
-        ("Total Collected", float(coll_summary.total_collected)),
-        ("Principal", float(coll_summary.principal)),
-        ("Interest Collected", float(coll_summary.interest_collected)),
-        ("Interest Rebate", float(coll_summary.interest_rebate)),
-        ("Late Fees", float(coll_summary.late_fees)),
-        ("NSF Fees", float(coll_summary.nsf_fees)),
-        ("Insurance Rebate", float(coll_summary.insurance_rebate)),
-        ("Balance Renewed", float(coll_summary.balance_renewed)),
-        ("Recovery", float(coll_summary.recovery)),
-        ("Amount to Refund", float(coll_summary.amount_to_refund)),
-        ("Cash Received", float(coll_summary.cash_received)),
-    ]
-    for label, val in coll_items:
-        ws_data[f'A{row}'] = label
-        ws_data[f'B{row}'] = val
-        if isinstance(val, float):
-            ws_data[f'B{row}'].number_format = money_format
-        ws_data[f'A{row}'].border = thin_border
-        ws_data[f'B{row}'].border = thin_border
-        row += 1
-
-    row += 1
-
-    # Loan Register summary
-    ws_data[f'A{row}'] = "LOAN REGISTER"
-    ws_data[f'A{row}'].font = header_font
-    ws_data[f'A{row}'].fill = header_fill
-    ws_data[f'B{row}'].fill = header_fill
-    row += 1
-    loan_items = [
-        ("Loans Originated", loan_summary.loan_count),
-        ("Note Amount", float(loan_summary.note_amount)),
-        ("Finance Charge", float(loan_summary.finance_charge)),
-        ("Cash to Borrower", float(loan_summary.cash_to_borrower)),
-        ("Credit Life Premium", float(loan_summary.credit_life_premium)),
-        ("A&H Premium", float(loan_summary.ah_premium)),
-        ("Balance Renewed", float(loan_summary.balance_renewed)),
-    ]
-    for label, val in loan_items:
-        ws_data[f'A{row}'] = label
-        ws_data[f'B{row}'] = val
-        if isinstance(val, float):
-            ws_data[f'B{row}'].number_format = money_format
-        ws_data[f'A{row}'].border = thin_border
-        ws_data[f'B{row}'].border = thin_border
-        row += 1
-
-    row += 1
-
-    # Charge Off summary
-    ws_data[f'A{row}'] = "CHARGE OFFS"
-    ws_data[f'A{row}'].font = header_font
-    ws_data[f'A{row}'].fill = header_fill
-    ws_data[f'B{row}'].fill = header_fill
-    row += 1
-    co_items = [
-        ("Accounts", co_summary.account_count),
-        ("Note Amount", float(co_summary.note_amount)),
-        ("Net Charge Off (P&L)", float(co_summary.charge_off_amount)),
-        ("Unearned Reversed", float(co_summary.pc_interest_rebate)),
-        ("Total Charge Off (Gross)", float(co_summary.total_charge_off_amt)),
-    ]
-    for label, val in co_items:
-        ws_data[f'A{row}'] = label
-        ws_data[f'B{row}'] = val
-        if isinstance(val, float):
-            ws_data[f'B{row}'].number_format = money_format
-        ws_data[f'A{row}'].border = thin_border
-        ws_data[f'B{row}'].border = thin_border
-        row += 1
-
-    row += 1
-
-    # Unearned Register summary
-    ws_data[f'A{row}'] = "UNEARNED REGISTER"
-    ws_data[f'A{row}'].font = header_font
-    ws_data[f'A{row}'].fill = header_fill
-    ws_data[f'B{row}'].fill = header_fill
-    row += 1
-    ue_items = [
-        ("Active Loans", ue_summary.loan_count),
-        ("Current Balance (Portfolio)", float(ue_summary.total_current_balance)),
-        ("Unearned Interest (New)", float(ue_summary.unearned_new_interest)),
-        ("Unearned Interest (Existing)", float(ue_summary.unearned_existing_interest)),
-        ("Total Unearned Interest", float(ue_summary.total_unearned_interest)),
-        ("Unearned Finance Fees", float(ue_summary.total_unearned_finance_fees)),
-        ("Unearned Credit Life", float(ue_summary.unearned_credit_life)),
-        ("Unearned Disability (A&H)", float(ue_summary.unearned_disability)),
-        ("Unearned IUI", float(ue_summary.unearned_iui)),
-        ("Unearned Property", float(ue_summary.unearned_property)),
-        ("Unearned VSI (Auto)", float(ue_summary.unearned_vsi)),
-        ("Total Unearned Insurance", float(ue_summary.total_unearned_insurance)),
-        ("Interest Collected This Month", float(ue_summary.interest_collected_month)),
-    ]
-    for label, val in ue_items:
-        ws_data[f'A{row}'] = label
-        ws_data[f'B{row}'] = val
-        if isinstance(val, float):
-            ws_data[f'B{row}'].number_format = money_format
-        ws_data[f'A{row}'].border = thin_border
-        ws_data[f'B{row}'].border = thin_border
-        row += 1
+    data_sheet = _Sheet("Source Data Summary", {"A": 35, "B": 18, "C": 18})
+    sheets.append(data_sheet)
+    rows = data_sheet.rows
+
+    coll_items = _summary_items(coll, _COLL_FIELDS)
+    loan_items = _summary_items(loan, _LOAN_FIELDS)
+    co_items = _summary_items(co, _CO_FIELDS)
+    ue_items = _summary_items(ue, _UE_FIELDS)
+
+    rows += [[_c(f"Source Data Summary — {period}", style="title")]]
+    for title, items in [("COLLECTION REGISTER", coll_items), ("LOAN REGISTER", loan_items),
+                         ("CHARGE OFFS", co_items), ("UNEARNED REGISTER", ue_items)]:
+        rows.append([])
+        rows += _section(title, items)
 
     # ── Sheet 5: QBO Import Format ──
-    ws_qbo = wb.create_sheet("QBO Import")
-    ws_qbo.column_dimensions['A'].width = 12
-    ws_qbo.column_dimensions['B'].width = 12
-    ws_qbo.column_dimensions['C'].width = 12
-    ws_qbo.column_dimensions['D'].width = 35
-    ws_qbo.column_dimensions['E'].width = 10
-    ws_qbo.column_dimensions['F'].width = 15
-    ws_qbo.column_dimensions['G'].width = 15
-    ws_qbo.column_dimensions['H'].width = 40
-
-    row = 1
-    ws_qbo['A1'] = "QBO Journal Entry Import Format"
-    ws_qbo['A1'].font = Font(bold=True, size=14)
-    row = 2
-    ws_qbo['A2'] = "Copy these entries into QuickBooks Online manually or via CSV import"
-    ws_qbo['A2'].font = Font(italic=True, size=10)
-    row = 4
-
-    qbo_headers = ["JE #", "Date", "Account #", "Account Name", "Class", "Debit", "Credit", "Memo"]
-    for col_idx, h in enumerate(qbo_headers, 1):
-        cell = ws_qbo.cell(row=row, column=col_idx, value=h)
-        cell.font = subheader_font
-        cell.fill = subheader_fill
-        cell.border = thin_border
-    row += 1
-
-    for je in journal_entries:
-        for line in je.lines:
-            ws_qbo[f'A{row}'] = je.je_number
-            ws_qbo[f'B{row}'] = je.je_date.strftime("%m/%d/%Y")
-            ws_qbo[f'C{row}'] = line.account_code
-            ws_qbo[f'D{row}'] = line.account_name
-            ws_qbo[f'E{row}'] = line.class_name
-            if line.debit > 0:
-                ws_qbo[f'F{row}'] = float(line.debit)
-                ws_qbo[f'F{row}'].number_format = money_format
-            if line.credit > 0:
-                ws_qbo[f'G{row}'] = float(line.credit)
-                ws_qbo[f'G{row}'].number_format = money_format
-            ws_qbo[f'H{row}'] = line.memo
-            for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
-                ws_qbo[f'{col}{row}'].border = thin_border
-            row += 1
-        row += 1  # Blank between JEs
-
-    # Save
-    # Build dynamic filename from period
-    period_parts = period.split()
-    if len(period_parts) == 2:
-        month_name, year = period_parts
-        output_filename = f"SET_Financial_EOM_Close_{month_name}{year}.xlsx"
-    else:
-        output_filename = f"SET_Financial_EOM_Close_{period.replace(' ', '_')}.xlsx"
+    if not qbo_sheet:
+        return sheets
+    qbo = _Sheet("QBO Import", {"A": 12, "B": 12, "C": 12, "D": 35,
+                                "E": 10, "F": 15, "G": 15, "H": 40})
+    sheets.append(qbo)
+    rows = qbo.rows
+
+    rows += [
+        [_c("QBO Journal Entry Import Format", style="title")],
+        [_c("Copy these entries into QuickBooks Online manually or via CSV import",
+              style="subtitle")],
+        [],
+        [_c(h, style="subheader")
+         for h in ["JE #", "Date", "Account #", "Account Name", "Class", "Debit", "Credit", "Memo"]],
+    ]
+
+    for je, je_amounts in zip(journal_entries, amounts):
+        # Constant across the JE's lines
+        je_number = _c(je.je_number, style="bordered")
+        # A real date cell (sortable/filterable in Excel), shown as mm/dd/yyyy
+        je_date = _c(je.je_date, style="date")
+        # The JE's lines are built in one comprehension and added in bulk,
+        # then a blank row separates it from the next JE
+        rows += [
+            [
+                je_number,
+                je_date,
+                _c(line.account_code, style="bordered"),
+                _c(line.account_name, style="bordered"),
+                _c(line.class_name, style="bordered"),
+                _c(debit, style="money") if debit > 0 else _BORDERED_BLANK,
+                _c(credit, style="money") if credit > 0 else _BORDERED_BLANK,
+                _c(line.memo, style="bordered"),
+            ]
+            for line, (debit, credit) in zip(je.lines, je_amounts)
+        ]
+        rows.append([])
+
+    return sheets
+
+
+def _write_openpyxl(sheets, output_path: Path):
+    """Render with a write-only openpyxl workbook: rows are streamed to disk
+    as they are appended, and each cell references a registered named style."""
+    import openpyxl
+    from openpyxl import LXML
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Border, Font, NamedStyle, PatternFill, Side
+    from openpyxl.styles.borders import DEFAULT_BORDER
+    from openpyxl.styles.fonts import DEFAULT_FONT
+
+    if not LXML:
+        # openpyxl picks lxml up automatically; without it the write-only
+        # sheets are serialised by the much slower pure-Python xmlfile
+        log.warning("  ⚠ lxml not installed — openpyxl close package save will be slower")
+    wb = openpyxl.Workbook(write_only=True)
+    thin = Side(style='thin')
+    thin_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    for name, spec in STYLES.items():
+        font_attrs = {k: spec[k] for k in ("bold", "italic", "size", "color") if k in spec}
+        attrs = {
+            # Unset parts fall back to the workbook defaults (Calibri 11, no border)
+            "font": Font(**font_attrs) if font_attrs else DEFAULT_FONT,
+            "border": thin_border if spec.get("border") else DEFAULT_BORDER,
+        }
+        if "fill" in spec:
+            attrs["fill"] = PatternFill(start_color=spec["fill"], end_color=spec["fill"],
+                                        fill_type="solid")
+        if "number_format" in spec:
+            attrs["number_format"] = spec["number_format"]
+        wb.add_named_style(NamedStyle(name, **attrs))
+
+    for sheet in sheets:
+        ws = wb.create_sheet(sheet.title)
+        # Widths and merges must be declared before any row is written
+        for col, width in sheet.widths.items():
+            ws.column_dimensions[col].width = width
+        for ref in sheet.merges:
+            ws.merged_cells.add(ref)
+        ws_append = ws.append
+        for row in sheet.rows:
+            cells = []
+            add = cells.append
+            for entry in row:
+                if entry is None:
+                    add(None)
+                    continue
+                value, style = entry
+                if style is None:
+                    # append() serialises bare values directly; only styled
+                    # cells need a WriteOnlyCell
+                    add(value)
+                    continue
+                c = WriteOnlyCell(ws, value=value)
+                c.style = style
+                add(c)
+            ws_append(cells)
 
-    output_path = Path(output_dir) / output_filename
     wb.save(str(output_path))
-    print(f"  ✓ Close package saved: {output_path}")
 
-    return output_path
+
+def _write_xlsxwriter(sheets, output_path: Path):
+    """Render with xlsxwriter in constant_memory mode: each row is flushed as
+    soon as the next one starts, so the sheets must be written top to bottom
+    (which the layout already is). Strings and numbers go straight to
+    write_string/write_number: write() would regex-scan every string for
+    URLs and formulas (and turn a memo starting with "=" into one)."""
+    import xlsxwriter
+    from xlsxwriter.utility import xl_cell_to_rowcol
+
+    wb = xlsxwriter.Workbook(str(output_path), {"constant_memory": True})
+    formats = {}
+    for name, spec in STYLES.items():
+        props = {}
+        if spec.get("bold"):
+            props["bold"] = True
+        if spec.get("italic"):
+            props["italic"] = True
+        if "size" in spec:
+            props["font_size"] = spec["size"]
+        if "color" in spec:
+            props["font_color"] = f"#{spec['color']}"
+        if "fill" in spec:
+            props.update(pattern=1, bg_color=f"#{spec['fill']}")
+        if spec.get("border"):
+            props["border"] = 1
+        if "number_format" in spec:
+            props["num_format"] = spec["number_format"]
+        formats[name] = wb.add_format(props)
+
+    for sheet in sheets:
+        ws = wb.add_worksheet(sheet.title)
+        for col, width in sheet.widths.items():
+            idx = xl_cell_to_rowcol(f"{col}1")[1]
+            ws.set_column(idx, idx, width)
+        # Merges are keyed by their top-left cell (0-based) and written in
+        # place. Grouped by row, so the many rows without a merge (every JE
+        # and QBO line) skip the per-cell lookup.
+        merge_ends = {}
+        for ref in sheet.merges:
+            first, last = ref.split(":")
+            (r0, c0), end = xl_cell_to_rowcol(first), xl_cell_to_rowcol(last)
+            merge_ends.setdefault(r0, {})[c0] = end
+        # Bound once per sheet: the cell loop below is the hottest in the writer
+        write_string, write_number, write_blank = ws.write_string, ws.write_number, ws.write_blank
+        for r, row in enumerate(sheet.rows):
+            row_merges = merge_ends.get(r)
+            for c, entry in enumerate(row):
+                if entry is None:
+                    continue
+                value, style = entry
+                fmt = formats[style] if style is not None else None
+                end = row_merges.get(c) if row_merges else None
+                if end is not None:
+                    ws.merge_range(r, c, end[0], end[1], value, fmt)
+                elif value is None or value == "":
+                    if fmt is not None:
+                        write_blank(r, c, None, fmt)
+                elif isinstance(value, str):
+                    write_string(r, c, value, fmt)
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    write_number(r, c, value, fmt)
+                else:
+                    ws.write(r, c, value, fmt)
+
+    wb.close()
@@ -7,50 +7,54 @@ Usage:
     python run_close.py --month 2025-12
     python run_close.py --month 2026-01
     python run_close.py --month 2026-01 --data-dir ./data/sample/
+    python run_close.py --month 2026-01 --writer openpyxl
+    python run_close.py --month 2026-01 --no-qbo-sheet
+    python run_close.py --month 2026-01 --no-cache
 """
 import sys
 import os
 import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from decimal import Decimal
+from decimal import Decimal, localcontext
 from datetime import date
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
-from parsers.collection_parser import parse_collection_register
-from parsers.loan_register_parser import parse_loan_register
-from parsers.charge_off_parser import parse_charge_offs
-from parsers.unearned_parser import parse_unearned_register
-from parsers.pier_statement_parser import parse_pier_statement
-from parsers.dpv_statement_parser import parse_dpv_statement
-from parsers.metacorp_parser import load_from_json, JANUARY_2026_SALE
-
-from journal_entries.je_engine import (
-    generate_je1_finance_income, generate_je2_insurance_earnings,
-    generate_je3_originations, generate_je4_collections,
-    generate_je5_charge_offs, generate_je6_bad_debt_sale,
-    generate_je7_pier_interest, generate_je8_dpv_interest,
-    generate_je9_allowance, generate_je10_recoveries,
-    JournalEntry,
-)
-
-from reconciliation.recon_engine import (
-    ReconciliationReport, build_loans_receivable_recon,
-    build_unearned_interest_recon, build_pier_balance_recon,
-    build_charge_off_validation, build_collections_validation,
-)
-
-from reports.excel_report import generate_excel_output
-from reports.csv_report import generate_csv_output
-
+# Only light modules are imported here; the parsers, JE engine and recon
+# engine (pandas, numpy, pdfplumber) are imported inside run_eom_close, so
+# `--help` and importing this module stay fast.
+from reports.excel_report import DEFAULT_WRITER as DEFAULT_EXCEL_WRITER, WRITERS as EXCEL_WRITERS
 from config.month_config import resolve_month
-from config.portfolios import get_class_name
+from config.portfolios import get_class_name, VALID_PORTFOLIO_IDS
+
+_ZERO = Decimal("0")
+_CENT = Decimal("0.01")
+_HUNDRED = Decimal(100)
+_TARGET_ALLOWANCE_PCT = Decimal(18)     # JE-9 target, % of net receivable
+_CLASS_TOTAL_TOLERANCE = Decimal("0.02")
+# Portfolio IDs accepted by the validation check (0 = unassigned/legacy)
+_VALID_PORTFOLIO_IDS: frozenset = VALID_PORTFOLIO_IDS | {0}
+
+_RULE = "=" * 70
+
+# Progress log; lazily %-formatted, so Decimal/date rendering only happens
+# for records that pass the level. Configured by the CLI entry point.
+log = logging.getLogger("eom_close")
+
+
+def _check_level(ok: bool) -> int:
+    """Log level for a check result: failures go out at WARNING."""
+    return logging.INFO if ok else logging.WARNING
 
 
 def _load_metacorp(config):
     """Load Metacorp sale data from JSON or fall back to hardcoded constant."""
+    from parsers.metacorp_parser import load_from_json, JANUARY_2026_SALE
+
     metacorp_path = config.file_paths.get("metacorp")
     if metacorp_path and metacorp_path.exists():
         return load_from_json(str(metacorp_path))
@@ -63,60 +67,113 @@ def _load_metacorp(config):
     )
 
 
-def run_eom_close(month_str: str, data_dir_override: str = None):
-    """Execute the full EOM close process for the specified month."""
+def run_eom_close(month_str: str, data_dir_override: str = None, excel_writer: str = DEFAULT_EXCEL_WRITER,
+                  qbo_sheet: bool = True):
+    """
+    Execute the full EOM close process for the specified month.
+
+    Progress is logged to the "eom_close" logger at INFO and failed checks
+    at WARNING. Only the CLI entry point configures logging, so callers
+    importing this function should configure it themselves (e.g.
+    logging.basicConfig(level=logging.INFO)) to see the progress output.
+    """
+    from parsers.collection_parser import parse_collection_register
+    from parsers.loan_register_parser import parse_loan_register
+    from parsers.charge_off_parser import parse_charge_offs
+    from parsers.unearned_parser import parse_unearned_register
+    from parsers.pier_statement_parser import parse_pier_statement
+    from parsers.dpv_statement_parser import parse_dpv_statement
+    from parsers.parse_cache import cached_parse
+
+    from journal_entries.je_engine import (
+        generate_je1_finance_income, generate_je2_insurance_earnings,
+        generate_je3_originations, generate_je4_collections,
+        generate_je5_charge_offs, generate_je6_bad_debt_sale,
+        generate_je7_pier_interest, generate_je8_dpv_interest,
+        generate_je9_allowance, JournalEntry,
+    )
+    from reconciliation.recon_engine import (
+        ReconciliationReport, build_unearned_interest_recon, build_pier_balance_recon,
+        build_charge_off_validation, build_collections_validation,
+    )
+    from reports.excel_report import generate_excel_output
+    from reports.csv_report import generate_csv_output
+
     config = resolve_month(month_str, data_dir_override)
     balances = config.prior_balances
+    balances_abs = config.prior_balances_abs
 
-    print("=" * 70)
-    print(f"  SET Financial Corporation — EOM Close: {config.period_label}")
-    print("=" * 70)
+    log.info(_RULE)
+    log.info("  SET Financial Corporation — EOM Close: %s", config.period_label)
+    log.info(_RULE)
 
     # ──────────────────────────────────────────────────────────
     # PHASE 1: PARSE ALL SOURCE FILES
     # ──────────────────────────────────────────────────────────
-    print("\n📁 PHASE 1: Parsing Source Files...")
-
-    # 1. Collection Register
-    coll_df, coll_summary = parse_collection_register(str(config.file_paths["collection"]))
-    print(f"  ✓ Collection Register: {coll_summary.transaction_count} transactions, "
-          f"${coll_summary.total_collected} collected")
-
-    # 2. Loan Register
-    loan_df, loan_summary = parse_loan_register(str(config.file_paths["loan"]))
-    print(f"  ✓ Loan Register: {loan_summary.loan_count} loans, "
-          f"${loan_summary.note_amount} originated")
-
-    # 3. Charge Offs
-    co_df, co_summary = parse_charge_offs(str(config.file_paths["charge_off"]))
-    print(f"  ✓ Charge Offs: {co_summary.account_count} accounts, "
-          f"${co_summary.total_charge_off_amt} total")
-
-    # 4. Unearned Register
-    ue_df, ue_summary = parse_unearned_register(str(config.file_paths["unearned"]))
-    print(f"  ✓ Unearned Register: {ue_summary.loan_count} loans, "
-          f"${ue_summary.total_unearned_interest} total unearned interest")
-
-    # 5. Pier Statement
-    pier_data = parse_pier_statement(str(config.file_paths["pier"]))
-    print(f"  ✓ Pier Statement: Balance ${pier_data.ending_balance}, "
-          f"Interest ${pier_data.accrued_interest_due}")
-
-    # 6. DPV Statement
-    dpv_data = parse_dpv_statement(str(config.file_paths["dpv"]))
-    print(f"  ✓ DPV Statement: Balance ${dpv_data.principal_balance}, "
-          f"Interest ${dpv_data.total_due}")
+    log.info("\n📁 PHASE 1: Parsing Source Files...")
+
+    # Files 1-6 share no state, so parse them side by side in worker
+    # processes (XLSX/PDF parsing is CPU-bound and holds the GIL). Results
+    # are collected in the original order to keep the log deterministic;
+    # unchanged files are served from the parse cache.
+    tasks = {
+        "collection": parse_collection_register,
+        "loan": parse_loan_register,
+        "charge_off": parse_charge_offs,
+        "unearned": parse_unearned_register,
+        "pier": parse_pier_statement,
+        "dpv": parse_dpv_statement,
+    }
+    with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+        futures = {
+            key: executor.submit(cached_parse, fn, str(config.file_paths[key]))
+            for key, fn in tasks.items()
+        }
+
+        # 1. Collection Register
+        coll_df, coll_summary = futures["collection"].result()
+        log.info("  ✓ Collection Register: %s transactions, $%s collected",
+                 coll_summary.transaction_count, coll_summary.total_collected)
+
+        # 2. Loan Register
+        loan_df, loan_summary = futures["loan"].result()
+        log.info("  ✓ Loan Register: %s loans, $%s originated",
+                 loan_summary.loan_count, loan_summary.note_amount)
+
+        # 3. Charge Offs
+        co_df, co_summary = futures["charge_off"].result()
+        log.info("  ✓ Charge Offs: %s accounts, $%s total",
+                 co_summary.account_count, co_summary.total_charge_off_amt)
+
+        # 4. Unearned Register
+        ue_df, ue_summary = futures["unearned"].result()
+        log.info("  ✓ Unearned Register: %s loans, $%s total unearned interest",
+                 ue_summary.loan_count, ue_summary.total_unearned_interest)
+
+        # 5. Pier Statement
+        pier_data = futures["pier"].result()
+        log.info("  ✓ Pier Statement: Balance $%s, Interest $%s",
+                 pier_data.ending_balance, pier_data.accrued_interest_due)
+
+        # 6. DPV Statement
+        dpv_data = futures["dpv"].result()
+        log.info("  ✓ DPV Statement: Balance $%s, Interest $%s",
+                 dpv_data.principal_balance, dpv_data.total_due)
 
     # 7. Metacorp Sale
     metacorp = _load_metacorp(config)
-    print(f"  ✓ Metacorp Sale: {metacorp.num_accounts} accounts, "
-          f"${metacorp.transfer_amount} proceeds")
+    log.info("  ✓ Metacorp Sale: %s accounts, $%s proceeds",
+             metacorp.num_accounts, metacorp.transfer_amount)
 
     # ──────────────────────────────────────────────────────────
     # PHASE 2: GENERATE JOURNAL ENTRIES (Class-Tagged by Portfolio)
     # ──────────────────────────────────────────────────────────
-    print("\n📝 PHASE 2: Generating Journal Entries (by QBO class)...")
+    log.info("\n📝 PHASE 2: Generating Journal Entries (by QBO class)...")
 
+    # Deliberately serial: the JE generators are pure in-memory Decimal
+    # arithmetic over the Phase 1 summaries (no file or network I/O), so a
+    # thread pool would only contend for the GIL and a process pool would
+    # spend more pickling the summaries than generating the entries.
     journal_entries = []
 
     # JE-1: Finance Income Recognition — BY CLASS
@@ -133,17 +190,18 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
         if port_interest > 0:
             sub = generate_je1_finance_income(
                 prior_month_unearned_interest=port_interest,  # synthetic prior = current + collected
-                current_month_unearned_interest=Decimal("0"),
+                current_month_unearned_interest=_ZERO,
                 je_date=config.je_date,
                 class_name=cls,
             )
-            je1.lines.extend(sub.lines)
+            je1.extend_lines(sub.lines)
     je1.notes = ("Using Collection Register InterestCollected per portfolio "
                  f"(total ${coll_summary.interest_collected}) as earned interest proxy. "
                  "Future months will use month-over-month unearned register delta.")
     je1.review_required = True
     journal_entries.append(je1)
-    print(f"  ✓ JE-1 Finance Income: ${je1.total_debits} (by class, estimated from interest collected)")
+    log.info("  ✓ JE-1 Finance Income: $%s (by class, estimated from interest collected)",
+             je1.total_debits)
 
     # JE-2: Insurance Premium Earnings — SET (aggregate, no class-level priors)
     current_insurance = {
@@ -154,16 +212,16 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
         "VSI": ue_summary.unearned_vsi,
     }
     prior_insurance = {
-        "CreditLife": abs(balances["110050_unearned_life"]) + Decimal("0"),
-        "Disability": abs(balances["110060_unearned_ah"]) + Decimal("0"),
-        "IUI": abs(balances["110070_unearned_iui"]),
-        "Property": abs(balances["110080_unearned_prop"]),
-        "VSI": abs(balances["110090_unearned_auto"]),
+        "CreditLife": balances_abs["110050_unearned_life"],
+        "Disability": balances_abs["110060_unearned_ah"],
+        "IUI": balances_abs["110070_unearned_iui"],
+        "Property": balances_abs["110080_unearned_prop"],
+        "VSI": balances_abs["110090_unearned_auto"],
     }
     je2 = generate_je2_insurance_earnings(prior_insurance, current_insurance, config.je_date,
                                           class_name="SET")
     journal_entries.append(je2)
-    print(f"  ✓ JE-2 Insurance Earnings: ${je2.total_debits} (class: SET)")
+    log.info("  ✓ JE-2 Insurance Earnings: $%s (class: SET)", je2.total_debits)
 
     # JE-3: Loan Originations — BY CLASS
     je3 = JournalEntry(
@@ -184,9 +242,10 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
             je_date=config.je_date,
             class_name=cls,
         )
-        je3.lines.extend(sub.lines)
+        je3.extend_lines(sub.lines)
     journal_entries.append(je3)
-    print(f"  ✓ JE-3 Originations: ${je3.total_debits} (by class, {loan_summary.loan_count} loans)")
+    log.info("  ✓ JE-3 Originations: $%s (by class, %s loans)",
+             je3.total_debits, loan_summary.loan_count)
 
     # JE-4: Collections — BY CLASS
     je4 = JournalEntry(
@@ -211,9 +270,9 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
             je_date=config.je_date,
             class_name=cls,
         )
-        je4.lines.extend(sub.lines)
+        je4.extend_lines(sub.lines)
     journal_entries.append(je4)
-    print(f"  ✓ JE-4 Collections: ${je4.total_debits} (by class)")
+    log.info("  ✓ JE-4 Collections: $%s (by class)", je4.total_debits)
 
     # JE-5: Charge-Offs — BY CLASS
     je5 = JournalEntry(
@@ -231,10 +290,11 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
             je_date=config.je_date,
             class_name=cls,
         )
-        je5.lines.extend(sub.lines)
+        je5.extend_lines(sub.lines)
     journal_entries.append(je5)
-    print(f"  ✓ JE-5 Charge-Offs: ${co_summary.total_charge_off_amt} total "
-          f"(${co_summary.charge_off_amount} net, ${co_summary.pc_interest_rebate} unearned) (by class)")
+    log.info("  ✓ JE-5 Charge-Offs: $%s total ($%s net, $%s unearned) (by class)",
+             co_summary.total_charge_off_amt, co_summary.charge_off_amount,
+             co_summary.pc_interest_rebate)
 
     # JE-6: Bad Debt Sale — SET (company-level)
     je6 = generate_je6_bad_debt_sale(
@@ -245,7 +305,7 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
         class_name="SET",
     )
     journal_entries.append(je6)
-    print(f"  ✓ JE-6 Bad Debt Sale: ${metacorp.transfer_amount} (class: SET)")
+    log.info("  ✓ JE-6 Bad Debt Sale: $%s (class: SET)", metacorp.transfer_amount)
 
     # JE-7: Pier Interest — SET (facility-level)
     je7 = generate_je7_pier_interest(
@@ -255,7 +315,7 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
         class_name="SET",
     )
     journal_entries.append(je7)
-    print(f"  ✓ JE-7 Pier Interest: ${pier_data.accrued_interest_due} (class: SET)")
+    log.info("  ✓ JE-7 Pier Interest: $%s (class: SET)", pier_data.accrued_interest_due)
 
     # JE-8: DPV Interest — SET (facility-level)
     je8 = generate_je8_dpv_interest(
@@ -265,13 +325,16 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
         class_name="SET",
     )
     journal_entries.append(je8)
-    print(f"  ✓ JE-8 DPV Interest: ${dpv_data.total_due} (class: SET)")
+    log.info("  ✓ JE-8 DPV Interest: $%s (class: SET)", dpv_data.total_due)
 
     # JE-9: Allowance for Credit Losses — SET (management judgment, aggregate)
     net_receivable = ue_summary.total_current_balance
-    current_allowance = abs(balances["110002_allowance"])
-    target_pct = Decimal("18")
-    target_allowance = (net_receivable * target_pct / Decimal("100")).quantize(Decimal("0.01"))
+    current_allowance = balances_abs["110002_allowance"]
+    target_pct = _TARGET_ALLOWANCE_PCT
+    # Cents-scale balances need far fewer than the default 28 digits
+    with localcontext() as ctx:
+        ctx.prec = 18
+        target_allowance = (net_receivable * target_pct / _HUNDRED).quantize(_CENT)
     adjustment = target_allowance - current_allowance
 
     je9 = generate_je9_allowance(
@@ -282,17 +345,17 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
         class_name="SET",
     )
     journal_entries.append(je9)
-    print(f"  ✓ JE-9 Allowance: Suggested adjustment ${adjustment} "
-          f"(current ${current_allowance}, target ${target_allowance}) (class: SET)")
+    log.info("  ✓ JE-9 Allowance: Suggested adjustment $%s (current $%s, target $%s) (class: SET)",
+             adjustment, current_allowance, target_allowance)
 
     # JE-10: Recoveries — consolidated into JE-4 (Collections)
     if coll_summary.recovery > 0:
-        print(f"  ℹ JE-10 Recoveries: ${coll_summary.recovery} (included in JE-4 Collections)")
+        log.info("  ℹ JE-10 Recoveries: $%s (included in JE-4 Collections)", coll_summary.recovery)
 
     # ──────────────────────────────────────────────────────────
     # PHASE 3: RECONCILIATION
     # ──────────────────────────────────────────────────────────
-    print("\n🔍 PHASE 3: Reconciliation Checks...")
+    log.info("\n🔍 PHASE 3: Reconciliation Checks...")
 
     recon = ReconciliationReport(period=config.period_label)
 
@@ -301,10 +364,11 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
         statement_balance=pier_data.ending_balance,
         qbo_pier_loc=balances["291300_pier_loc"],
     )
-    recon.items.append(pier_recon)
-    print(f"  {'✓' if pier_recon.status == 'PASS' else '✗'} Pier Balance: "
-          f"Statement ${pier_data.ending_balance} vs QBO ${balances['291300_pier_loc']} "
-          f"→ {pier_recon.status}")
+    recon.add_item(pier_recon)
+    log.log(_check_level(pier_recon.status != "FAIL"),
+            "  %s Pier Balance: Statement $%s vs QBO $%s → %s",
+            '✓' if pier_recon.status == 'PASS' else '✗', pier_data.ending_balance,
+            balances['291300_pier_loc'], pier_recon.status)
 
     # Unearned interest check
     ue_recon = build_unearned_interest_recon(
@@ -314,10 +378,11 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
     ue_recon.notes = (f"QBO balance may not be as of {config.je_date}. "
                       f"Diff of ${abs(ue_recon.difference)} may include activity after month-end. "
                       f"Re-run with exact month-end QBO trial balance for true recon.")
-    recon.items.append(ue_recon)
-    print(f"  ⚠ Unearned Interest: Register ${ue_summary.total_unearned_interest} "
-          f"vs QBO ${abs(balances['110010_unearned_interest'])} "
-          f"→ EXPECTED DIFF due to date mismatch (diff: ${ue_recon.difference})")
+    recon.add_item(ue_recon)
+    log.info("  ⚠ Unearned Interest: Register $%s vs QBO $%s "
+             "→ EXPECTED DIFF due to date mismatch (diff: $%s)",
+             ue_summary.total_unearned_interest, balances_abs['110010_unearned_interest'],
+             ue_recon.difference)
 
     # Charge-off validation
     co_valid = build_charge_off_validation(
@@ -331,7 +396,8 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
         f"Net ${co_summary.charge_off_amount} + Unearned ${co_summary.pc_interest_rebate} "
         f"= ${co_valid['expected_total']} vs Total ${co_summary.total_charge_off_amt}"
     )
-    print(f"  {'✓' if co_valid['status'] == 'PASS' else '✗'} Charge-Off Components: {co_valid['status']}")
+    log.log(_check_level(co_valid['status'] == 'PASS'), "  %s Charge-Off Components: %s",
+            '✓' if co_valid['status'] == 'PASS' else '✗', co_valid['status'])
 
     # Collections validation
     coll_valid = build_collections_validation(
@@ -352,23 +418,25 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
         f"Cash ${coll_summary.cash_received}, Principal ${coll_summary.principal}, "
         f"Interest ${coll_summary.interest_collected}, Fees ${coll_summary.late_fees + coll_summary.nsf_fees}"
     )
-    print(f"  ✓ Collections Validation: {coll_valid['status']}")
+    log.log(_check_level(coll_valid['status'] != 'FAIL'), "  %s Collections Validation: %s",
+            '✗' if coll_valid['status'] == 'FAIL' else '✓', coll_valid['status'])
 
-    # JE balance checks
-    all_balanced = True
-    for je in journal_entries:
-        if not je.is_balanced and len(je.lines) > 0:
-            all_balanced = False
+    # JE balance checks — all() stops at the first unbalanced JE; the
+    # per-JE detail pass only runs when something is actually off.
+    if all(je.is_balanced or not je.lines for je in journal_entries):
+        recon.add_validation("All JEs Balanced", True, "All journal entries have matching debits and credits")
+        log.info("  ✓ All journal entries balanced")
+    else:
+        for je in journal_entries:
+            if not je.lines or je.is_balanced:
+                continue
+            total_dr, total_cr = je.total_debits, je.total_credits
             recon.add_validation(
                 f"{je.je_number} Balance Check",
                 False,
-                f"Debits ${je.total_debits} ≠ Credits ${je.total_credits}"
+                f"Debits ${total_dr} ≠ Credits ${total_cr}"
             )
-            print(f"  ✗ {je.je_number}: UNBALANCED (DR ${je.total_debits} vs CR ${je.total_credits})")
-
-    if all_balanced:
-        recon.add_validation("All JEs Balanced", True, "All journal entries have matching debits and credits")
-        print(f"  ✓ All journal entries balanced")
+            log.warning("  ✗ %s: UNBALANCED (DR $%s vs CR $%s)", je.je_number, total_dr, total_cr)
 
     # Class-level totals vs aggregate validation
     class_tagged_jes = {
@@ -384,62 +452,65 @@ def run_eom_close(month_str: str, data_dir_override: str = None):
             else:
                 actual = je.total_debits
             diff = abs(actual - expected)
-            ok = diff < Decimal("0.02")
+            ok = diff < _CLASS_TOTAL_TOLERANCE
             recon.add_validation(
                 f"{je.je_number} Class Totals Match Aggregate",
                 ok,
                 f"Class sum ${actual} vs aggregate ${expected} (diff ${diff})"
             )
-            print(f"  {'✓' if ok else '✗'} {je.je_number} class total: ${actual} vs aggregate ${expected}")
+            log.log(_check_level(ok), "  %s %s class total: $%s vs aggregate $%s",
+                    '✓' if ok else '✗', je.je_number, actual, expected)
 
     # Duplicate loan check
-    dupes = loan_df[loan_df.duplicated(subset=["LoanNumber"], keep=False)]
-    has_dupes = len(dupes) > 0
+    dupe_rows = int(loan_df["LoanNumber"].duplicated(keep=False).sum())
+    has_dupes = dupe_rows > 0
     recon.add_validation(
         "No Duplicate Loan Numbers",
         not has_dupes,
-        f"{len(dupes)} duplicates found" if has_dupes else "All loan numbers unique"
+        f"{dupe_rows} duplicates found" if has_dupes else "All loan numbers unique"
     )
-    print(f"  {'✗' if has_dupes else '✓'} Duplicate Loan Check: "
-          f"{'FAIL' if has_dupes else 'PASS'}")
+    log.log(_check_level(not has_dupes), "  %s Duplicate Loan Check: %s",
+            '✗' if has_dupes else '✓', 'FAIL' if has_dupes else 'PASS')
 
     # Portfolio ID validation
-    from config.portfolios import VALID_PORTFOLIO_IDS
     invalid_ports = set()
     for df_check in [loan_df, co_df]:
         port_col = "PortfolioID" if "PortfolioID" in df_check.columns else "PortfolioId"
         if port_col in df_check.columns:
-            for pid in df_check[port_col].unique():
-                if int(pid) not in VALID_PORTFOLIO_IDS and int(pid) != 0:
-                    invalid_ports.add(int(pid))
+            ids = df_check[port_col]
+            bad = ids[~ids.isin(_VALID_PORTFOLIO_IDS)].dropna().unique()
+            invalid_ports.update(bad.astype("int64").tolist())
     recon.add_validation(
         "Valid Portfolio IDs",
         len(invalid_ports) == 0,
         f"Invalid IDs: {invalid_ports}" if invalid_ports else "All portfolio IDs valid"
     )
-    print(f"  {'✗' if invalid_ports else '✓'} Portfolio ID Check: "
-          f"{'FAIL - ' + str(invalid_ports) if invalid_ports else 'PASS'}")
+    log.log(_check_level(not invalid_ports), "  %s Portfolio ID Check: %s",
+            '✗' if invalid_ports else '✓',
+            'FAIL - ' + str(invalid_ports) if invalid_ports else 'PASS')
 
     # ──────────────────────────────────────────────────────────
     # PHASE 4: GENERATE OUTPUT
     # ──────────────────────────────────────────────────────────
-    print("\n📊 PHASE 4: Generating Output Files...")
+    log.info("\n📊 PHASE 4: Generating Output Files...")
 
     # Generate Excel close package
     generate_excel_output(journal_entries, recon, coll_summary, loan_summary,
                           co_summary, ue_summary, pier_data, dpv_data, metacorp,
-                          config.output_dir, config.period_label)
+                          config.output_dir, config.period_label, writer=excel_writer,
+                          qbo_sheet=qbo_sheet)
 
     # Generate CSV for QBO import
     generate_csv_output(journal_entries, config.output_dir, config.period_label)
 
-    print(f"\n{'=' * 70}")
-    print(f"  EOM Close Complete: {config.period_label}")
-    print(f"  Journal Entries: {len(journal_entries)}")
-    print(f"  Recon Checks: {recon.pass_count} PASS, {recon.warning_count} WARNING, {recon.fail_count} FAIL")
-    print(f"  Validations: {len(recon.validation_checks)}")
-    print(f"  Output: {config.output_dir}")
-    print(f"{'=' * 70}")
+    log.info("\n" + _RULE)
+    log.info("  EOM Close Complete: %s", config.period_label)
+    log.info("  Journal Entries: %s", len(journal_entries))
+    log.log(_check_level(not recon.fail_count), "  Recon Checks: %s PASS, %s WARNING, %s FAIL",
+            recon.pass_count, recon.warning_count, recon.fail_count)
+    log.info("  Validations: %s", len(recon.validation_checks))
+    log.info("  Output: %s", config.output_dir)
+    log.info(_RULE)
 
     return journal_entries, recon
 
@@ -456,5 +527,23 @@ if __name__ == "__main__":
         "--data-dir", default=None,
         help="Optional override for source data directory (default: data/{YYYY-MM}/)"
     )
+    parser.add_argument(
+        "--writer", choices=EXCEL_WRITERS, default=DEFAULT_EXCEL_WRITER,
+        help=f"Excel backend for the close package (default: {DEFAULT_EXCEL_WRITER}; "
+             "xlsxwriter streams rows, lower memory)"
+    )
+    parser.add_argument(
+        "--no-qbo-sheet", dest="qbo_sheet", action="store_false",
+        help="Leave the QBO Import sheet out of the close package (the QBO CSV is still written)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Ignore cached parse results and re-read every source file (same as EOM_NO_CACHE=1)"
+    )
     args = parser.parse_args()
-    run_eom_close(args.month, args.data_dir)
+    if args.no_cache:
+        # Set before the parser pool starts so the worker processes see it too
+        os.environ["EOM_NO_CACHE"] = "1"
+    logging.basicConfig(level=logging.INFO, format="%(message)s",
+                        handlers=[logging.StreamHandler(sys.stdout)])
+    run_eom_close(args.month, args.data_dir, args.writer, args.qbo_sheet)
@@ -0,0 +1,5 @@
+"""Put src/ on sys.path, the way run_close.py runs it."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
@@ -0,0 +1,81 @@
+"""Both Excel writer backends must produce the same workbook content."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+pytest.importorskip("xlsxwriter")
+
+from journal_entries.je_engine import JournalEntry  # noqa: E402
+from parsers.charge_off_parser import ChargeOffSummary  # noqa: E402
+from parsers.collection_parser import CollectionSummary  # noqa: E402
+from parsers.dpv_statement_parser import DPVStatementData  # noqa: E402
+from parsers.loan_register_parser import LoanRegisterSummary  # noqa: E402
+from parsers.metacorp_parser import MetacorpSaleData  # noqa: E402
+from parsers.pier_statement_parser import PierStatementData  # noqa: E402
+from parsers.unearned_parser import UnearnedSummary  # noqa: E402
+from reconciliation.recon_engine import ReconciliationReport, RollForward  # noqa: E402
+from reports.excel_report import generate_excel_output  # noqa: E402
+
+D = Decimal
+
+
+def _close_inputs():
+    je = JournalEntry(je_number="JE-1", description="Finance income",
+                      je_date=date(2026, 1, 31), review_required=True)
+    je.add_line("110010", debit=D("1234.56"), memo="Unearned", class_name="SC")
+    je.add_line("400000", credit=D("1234.56"), memo="Earned", class_name="SC")
+
+    recon = ReconciliationReport(period="January 2026")
+    recon.add_check("Pier balance", D("1000.00"), D("1000.00"))
+    recon.add_check("Unearned interest", D("500.00"), D("560.25"))
+    recon.add_check("Loans receivable", D("10.00"), D("900.00"))
+    recon.add_validation("All JEs Balanced", True, "ok")
+    recon.add_validation("No Duplicate Loan Numbers", False, "2 duplicates found")
+    recon.roll_forwards.append(RollForward(
+        name="Loans Receivable", beginning_balance=D("100.00"),
+        additions={"Originations": D("50.00")}, subtractions={"Collections": D("25.50")},
+        actual_ending=D("124.50"),
+    ))
+
+    return ([je], recon,
+            CollectionSummary(total_collected=D("321.09"), principal=D("200.00")),
+            LoanRegisterSummary(note_amount=D("5000.00")),
+            ChargeOffSummary(total_charge_off_amt=D("75.25")),
+            UnearnedSummary(total_unearned_interest=D("888.88")),
+            PierStatementData(), DPVStatementData(), MetacorpSaleData())
+
+
+def _contents(path):
+    wb = openpyxl.load_workbook(path)
+    return {
+        ws.title: (
+            [list(row) for row in ws.iter_rows(values_only=True)],
+            sorted(str(rng) for rng in ws.merged_cells.ranges),
+        )
+        for ws in wb.worksheets
+    }
+
+
+@pytest.mark.parametrize("qbo_sheet", [True, False])
+def test_writers_produce_same_cells_and_merges(tmp_path, qbo_sheet):
+    inputs = _close_inputs()
+    books = {}
+    for writer in ("openpyxl", "xlsxwriter"):
+        out_dir = tmp_path / writer
+        out_dir.mkdir()
+        path = generate_excel_output(*inputs, out_dir, "January 2026",
+                                     writer=writer, qbo_sheet=qbo_sheet)
+        books[writer] = _contents(path)
+
+    assert list(books["openpyxl"]) == list(books["xlsxwriter"])
+    assert ("QBO Import" in books["openpyxl"]) == qbo_sheet
+    for title, (values, merges) in books["openpyxl"].items():
+        assert books["xlsxwriter"][title] == (values, merges), title
+        assert any(any(v is not None for v in row) for row in values), title
+
+
+def test_unknown_writer_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        generate_excel_output(*_close_inputs(), tmp_path, "January 2026", writer="csv")
@@ -0,0 +1,54 @@
+"""JournalEntry running totals must match a fresh sum over its lines."""
+from datetime import date
+from decimal import Decimal
+
+from journal_entries.je_engine import JournalEntry, JournalEntryLine
+
+D = Decimal
+
+
+def _entry(**kwargs):
+    return JournalEntry(je_number="JE-X", description="test",
+                        je_date=date(2026, 1, 31), **kwargs)
+
+
+def _assert_totals_match_lines(je):
+    assert je.total_debits == sum(line.debit for line in je.lines)
+    assert je.total_credits == sum(line.credit for line in je.lines)
+
+
+def test_add_line_updates_totals():
+    je = _entry()
+    je.add_line("400000", debit=D("100.005"))
+    je.add_line("110010", credit=100.01)
+    je.add_line("100120", debit=0, credit=0)  # zero lines are skipped
+    assert len(je.lines) == 2
+    assert (je.total_debits, je.total_credits) == (D("100.01"), D("100.01"))
+    assert je.is_balanced
+    _assert_totals_match_lines(je)
+
+
+def test_extend_lines_updates_totals():
+    je = _entry()
+    je.add_line("400000", debit=D("50.00"))
+    je.extend_lines([
+        JournalEntryLine("110010", "Unearned", credit=D("30.00")),
+        JournalEntryLine("110010", "Unearned", credit=D("20.00"), class_name="SC"),
+    ])
+    assert (je.total_debits, je.total_credits) == (D("50.00"), D("50.00"))
+    _assert_totals_match_lines(je)
+
+
+def test_lines_passed_at_construction_are_totalled():
+    je = _entry(lines=[JournalEntryLine("400000", "Finance Income", debit=D("10.00"))])
+    assert (je.total_debits, je.total_credits) == (D("10.00"), D("0"))
+    assert not je.is_balanced
+
+
+def test_unbalanced_beyond_tolerance():
+    je = _entry()
+    je.add_line("400000", debit=D("10.00"))
+    je.add_line("110010", credit=D("9.98"))
+    assert not je.is_balanced
+    je.add_line("110010", credit=D("0.01"))
+    assert je.is_balanced
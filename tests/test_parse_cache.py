@@ -0,0 +1,97 @@
+"""Parse and sheet caches must re-parse when the source file or parser code changes."""
+import os
+
+import pandas as pd
+import pytest
+
+from parsers import excel_reader, parse_cache
+
+CALLS = []
+
+
+def _parse(filepath):
+    CALLS.append(filepath)
+    with open(filepath) as f:
+        return {"text": f.read()}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Point both caches and the code stamp at scratch directories."""
+    code_dir = tmp_path / "code"
+    code_dir.mkdir()
+    (code_dir / "parser.py").write_text("VERSION = 1\n")
+    monkeypatch.setattr(excel_reader, "CACHE_DIR", tmp_path / "sheets")
+    monkeypatch.setattr(parse_cache, "PARSE_CACHE_DIR", tmp_path / "parsed")
+    monkeypatch.setattr(parse_cache, "_CODE_DIRS", (code_dir,))
+    monkeypatch.delenv(excel_reader.NO_CACHE_ENV, raising=False)
+    parse_cache._code_stamp.cache_clear()
+    CALLS.clear()
+    yield code_dir
+    parse_cache._code_stamp.cache_clear()
+
+
+def _touch(path, text):
+    """Rewrite path and move its mtime forward, so the change is visible
+    even on filesystems with coarse timestamps."""
+    st = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_unchanged_source_is_served_from_cache(cache, tmp_path):
+    src = tmp_path / "register.txt"
+    src.write_text("a")
+    assert parse_cache.cached_parse(_parse, src) == {"text": "a"}
+    assert parse_cache.cached_parse(_parse, src) == {"text": "a"}
+    assert len(CALLS) == 1
+
+
+def test_source_change_reparses(cache, tmp_path):
+    src = tmp_path / "register.txt"
+    src.write_text("a")
+    parse_cache.cached_parse(_parse, src)
+    _touch(src, "bb")
+    assert parse_cache.cached_parse(_parse, src) == {"text": "bb"}
+    assert len(CALLS) == 2
+
+
+def test_code_change_reparses(cache, tmp_path):
+    src = tmp_path / "register.txt"
+    src.write_text("a")
+    parse_cache.cached_parse(_parse, src)
+    _touch(cache / "parser.py", "VERSION = 22\n")
+    parse_cache._code_stamp.cache_clear()  # a new process recomputes the stamp
+    parse_cache.cached_parse(_parse, src)
+    assert len(CALLS) == 2
+
+
+def test_cache_version_bump_reparses(cache, tmp_path, monkeypatch):
+    src = tmp_path / "register.txt"
+    src.write_text("a")
+    parse_cache.cached_parse(_parse, src)
+    monkeypatch.setattr(parse_cache, "CACHE_VERSION", parse_cache.CACHE_VERSION + 1)
+    parse_cache.cached_parse(_parse, src)
+    assert len(CALLS) == 2
+
+
+def test_no_cache_env_bypasses(cache, tmp_path, monkeypatch):
+    src = tmp_path / "register.txt"
+    src.write_text("a")
+    parse_cache.cached_parse(_parse, src)
+    monkeypatch.setenv(excel_reader.NO_CACHE_ENV, "1")
+    parse_cache.cached_parse(_parse, src)
+    parse_cache.cached_parse(_parse, src)
+    assert len(CALLS) == 3
+
+
+def test_read_sheet_picks_up_workbook_changes(cache, tmp_path):
+    book = tmp_path / "register.xlsx"
+    pd.DataFrame({"Amount": [1.5]}).to_excel(book, sheet_name="Sheet2", index=False)
+    assert excel_reader.read_sheet(book, numeric_cols=("Amount",))["Amount"].tolist() == [1.5]
+    assert any((tmp_path / "sheets").glob("*.parquet"))
+
+    st = book.stat()
+    pd.DataFrame({"Amount": [2.25, 3.0]}).to_excel(book, sheet_name="Sheet2", index=False)
+    os.utime(book, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert excel_reader.read_sheet(book, numeric_cols=("Amount",))["Amount"].tolist() == [2.25, 3.0]
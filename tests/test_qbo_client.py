@@ -0,0 +1,31 @@
+"""Response cache TTLs: only periods marked closed are cached long."""
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("requests")
+
+from qbo.client import (  # noqa: E402
+    CHART_OF_ACCOUNTS_TTL, CLOSED_PERIOD_TTL, CURRENT_PERIOD_TTL, _cache_ttl,
+)
+
+TODAY = date.today().isoformat()
+LAST_YEAR = (date.today() - timedelta(days=365)).isoformat()
+
+
+@pytest.mark.parametrize("path, params, closed_through, expected", [
+    # Anything touching today is never cached
+    ("reports/BalanceSheet", {"end_date": TODAY}, TODAY, 0),
+    ("query", {"query": "select * from Account", "as_of": TODAY}, None, 0),
+    # Chart of accounts
+    ("query", {"query": "select * from Account"}, None, CHART_OF_ACCOUNTS_TTL),
+    # A past period is not treated as closed unless marked
+    ("reports/ProfitAndLoss", {"end_date": LAST_YEAR}, None, CURRENT_PERIOD_TTL),
+    ("reports/ProfitAndLoss", {"end_date": LAST_YEAR}, LAST_YEAR, CLOSED_PERIOD_TTL),
+    ("reports/ProfitAndLoss", {"end_date": "2026-01-31"}, "2026-01-30", CURRENT_PERIOD_TTL),
+    ("reports/ProfitAndLoss", {"end_date": "2025-12-31"}, "2026-01-31", CLOSED_PERIOD_TTL),
+    # No end date: current period
+    ("reports/TrialBalance", {}, "2026-01-31", CURRENT_PERIOD_TTL),
+])
+def test_cache_ttl(path, params, closed_through, expected):
+    assert _cache_ttl(path, params, closed_through) == expected
@@ -0,0 +1,43 @@
+"""ReconItem grading: PASS within a penny, WARNING within tolerance, else FAIL."""
+from dataclasses import replace
+from decimal import Decimal
+
+import pytest
+
+from reconciliation.recon_engine import ReconciliationReport, ReconItem
+
+D = Decimal
+
+CASES = [
+    # source, target, tolerance, expected status
+    (D("100.00"), D("100.00"), D("100"), "PASS"),
+    (D("100.01"), D("100.00"), D("100"), "PASS"),
+    (D("0.0149"), D("0"), D("100"), "WARNING"),
+    (D("0.005"), D("0"), D("0.01"), "PASS"),
+    (D("150.00"), D("100.00"), D("100"), "WARNING"),
+    (D("200.00"), D("100.00"), D("100"), "WARNING"),
+    (D("-250.75"), D("0.00"), D("100"), "FAIL"),
+    (D("10.02"), D("10.00"), D("0.01"), "FAIL"),
+]
+
+
+@pytest.mark.parametrize("source, target, tolerance, expected", CASES)
+def test_status(source, target, tolerance, expected):
+    item = ReconItem(name="x", source_value=source, target_value=target,
+                     tolerance=tolerance)
+    assert item.status == expected
+    assert item.difference == source - target
+
+
+def test_report_tallies():
+    report = ReconciliationReport(period="2026-09")
+    for source, target, tolerance, _ in CASES:
+        report.add_check("x", source, target, tolerance)
+    assert (report.pass_count, report.warning_count, report.fail_count) == (3, 3, 2)
+
+
+def test_replace_re_evaluates():
+    item = ReconItem(name="x", source_value=D("1"), target_value=D("1"))
+    changed = replace(item, source_value=D("500"))
+    assert changed.difference == D("499")
+    assert changed.status == "FAIL"